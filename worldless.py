@@ -7,11 +7,76 @@ import os
 import random
 import re
 import csv
+import io
 import threading
 import queue
+import gzip
+import math
+import time
+import itertools
+import multiprocessing
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # 没有 NumPy 时用连续字节存储, 逐词计算
+    np = None
+
+try:
+    import lzma
+except ImportError:  # 部分 Python 编译时未包含 lzma
+    lzma = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 CONFIG_FILE = "Wordle_config.json"
+HISTORY_FILE = "Wordle_history.jsonl"
+STATS_FILE = "Wordle_stats.json"
+SAVE_FILE = "Wordle_save.json"
 GITHUB_URL = "https://github.com/13335637282/worldless"
+DICT_URL = "https://gitee.com/yuxiqin/100000-english-words/raw/master/EnWords.csv"
+
+# 目标词难度: 随机为均匀抽取, 简单偏向常见词, 困难偏向生僻词
+DIFFICULTY_LEVELS = ("随机", "简单", "困难")
+
+# 同时猜测的棋盘数量
+BOARD_COUNTS = (1, 2, 4, 8)
+
+# 游戏代码中单词和尝试次数的分隔符
+GAME_CODE_SEPARATOR = "::"
+
+# 编译后的词库缓存文件标识
+CACHE_MAGIC = b"WLC1"
+RATING_MAGIC = b"WLD1"
+SUGGEST_MAGIC = b"WLS1"
+
+# 词库文件超过此大小时分块交给多个进程解析
+PARALLEL_MIN_SIZE = 8 * 1024 * 1024
+CHUNK_SIZE = 16 * 1024 * 1024
+
+WORD_PATTERN = re.compile(r"^[a-z]{3,12}$", re.M)
+COLOR_PATTERN = re.compile(r"#[0-9a-fA-F]{6}")
+
+# 随程序附带的压缩词库, 按优先顺序排列, 只使用当前环境能解压的格式.
+# 发布前由 worldless_bundle.py 生成, 仓库中不包含
+BUNDLED_DICT_DIR = os.path.dirname(os.path.abspath(__file__))
+COMPRESSED_SUFFIXES = tuple(suffix for suffix, module in (
+    (".zst", zstandard),
+    (".xz", lzma),
+    (".gz", gzip)
+) if module is not None)
+
+# 流式解析压缩词库时每次解压的字节数
+STREAM_BLOCK_SIZE = 4 * 1024 * 1024
 
 
 def check_disclaimer_agreement():
@@ -49,10 +114,12 @@ def show_disclaimer() -> None:
        1. 本软件按"原样"提供，不提供任何形式的明示或暗示担保
        2. 作者不对因使用本软件而导致的任何损害或损失负责
        3. 用户使用本软件的风险完全由用户自行承担
-       4. 本软件不会收集、存储或传输任何用户数据
+       4. 本软件不会收集或传输任何用户数据, 游戏数据仅保存在本机
 
        隐私声明:
        - 本软件不会收集任何用户个人信息
+       - 游戏记录、统计和未完成的对局保存在程序目录下
+         (Wordle_history.jsonl, Wordle_stats.json, Wordle_save.json), 删除即可清除
        - 所有数据处理均在本地设备上进行
        - 不会上传任何数据到远程服务器
 
@@ -116,6 +183,1450 @@ def show_disclaimer() -> None:
     disclaimer_window.mainloop()
 
 
+def score_guess(guess, target):
+    """计算猜测结果, 每个位置返回 2(正确位置) 1(存在但位置错误) 0(不存在)"""
+    codes = ["0"] * len(guess)
+
+    # 复制目标词字母计数
+    target_count = {}
+    for char in target:
+        target_count[char] = target_count.get(char, 0) + 1
+
+    # 先标记正确位置
+    for i, char in enumerate(guess):
+        if char == target[i]:
+            codes[i] = "2"
+            target_count[char] -= 1
+
+    # 再标记存在但位置错误的字母
+    for i, char in enumerate(guess):
+        if codes[i] == "0" and target_count.get(char, 0) > 0:
+            codes[i] = "1"
+            target_count[char] -= 1
+
+    return "".join(codes)
+
+
+def parse_dictionary_text(text):
+    """解析一段完整的 CSV 文本, 返回 (单词列表, 释义列表, [(单词, 词频), ...]), 保持文件顺序"""
+    candidates = []
+    raw_meanings = []
+    raw_frequencies = []
+    for row in csv.reader(io.StringIO(text)):
+        if len(row) < 2:
+            continue
+        candidates.append(row[0].strip().lower())
+        raw_meanings.append(row[1])
+        raw_frequencies.append(row[2] if len(row) > 2 else None)
+
+    # 只保留3-12字母的单词, 用一次正则匹配整批候选词
+    valid = set(WORD_PATTERN.findall("\n".join(candidates)))
+    keep = [i for i, word in enumerate(candidates) if word in valid]
+
+    words = [candidates[i] for i in keep]
+    meanings = [raw_meanings[i].strip() for i in keep]
+
+    # 第三列为可选词频
+    frequencies = []
+    for i in keep:
+        if raw_frequencies[i] is not None:
+            try:
+                frequencies.append((candidates[i], float(raw_frequencies[i])))
+            except ValueError:
+                pass
+    return words, meanings, frequencies
+
+
+def parse_dictionary_chunk(path, start, end):
+    """解析文件中 [start, end) 字节范围, 范围两端都在记录边界上"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return parse_dictionary_text(data.decode("utf-8"))
+
+
+def find_chunk_boundaries(path, chunk_size):
+    """按大约 chunk_size 把文件切成若干段, 每段都在换行处结束且不在引号字段内部"""
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, "rb") as f:
+        scanned = 0  # 已统计引号的位置
+        quotes = 0  # 文件开头到 scanned 之间的引号数
+        target = chunk_size
+        while target < size:
+            f.seek(scanned)
+            block = f.read(target - scanned)
+            quotes += block.count(b'"')
+            scanned = target
+
+            # 从目标位置往后找第一个引号数为偶数的换行
+            boundary = -1
+            while boundary < 0:
+                f.seek(scanned)
+                block = f.read(64 * 1024)
+                if not block:
+                    break
+                position = 0
+                while True:
+                    newline = block.find(b"\n", position)
+                    if newline < 0:
+                        quotes += block.count(b'"', position)
+                        scanned += len(block)
+                        break
+                    quotes += block.count(b'"', position, newline)
+                    position = newline + 1
+                    if quotes % 2 == 0:
+                        boundary = scanned + position
+                        scanned = boundary
+                        break
+            if boundary < 0:
+                break
+            boundaries.append(boundary)
+            target = boundary + chunk_size
+    if boundaries[-1] != size:
+        boundaries.append(size)
+    return boundaries
+
+
+def read_dictionary_file(path, workers=None, stats=None, chunk_size=CHUNK_SIZE):
+    """读取 CSV 词库, 返回 (单词列表, 释义字典, 词频字典)
+
+    大文件按记录边界分块后用进程池并行解析, 只有一个 CPU 时在本进程依次解析.
+    压缩词库 (.zst/.xz/.gz) 交给 read_compressed_dictionary 边解压边解析.
+    重复的单词以文件中第一次出现为准, 词频取第一条带词频的记录.
+    传入 stats 字典时写入解析耗时和吞吐量.
+    """
+    if path.endswith((".zst", ".xz", ".gz")):
+        return read_compressed_dictionary(path, stats)
+
+    started = time.perf_counter()
+    size = os.path.getsize(path)
+    workers = workers or os.cpu_count() or 1
+
+    if size < PARALLEL_MIN_SIZE:
+        boundaries = [0, size]
+    else:
+        boundaries = find_chunk_boundaries(path, chunk_size)
+    ranges = list(zip(boundaries, boundaries[1:]))
+
+    if len(ranges) > 1 and workers > 1:
+        # 游戏在加载线程中调用, 用 spawn 启动子进程, 避免 fork 复制持有锁的其他线程
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            chunks = list(pool.map(parse_dictionary_chunk, [path] * len(ranges),
+                                   [start for start, _ in ranges], [end for _, end in ranges]))
+    else:
+        chunks = [parse_dictionary_chunk(path, start, end) for start, end in ranges]
+
+    if stats is not None:
+        seconds = time.perf_counter() - started
+        stats.update({
+            "bytes": size,
+            "chunks": len(ranges),
+            "workers": workers if len(ranges) > 1 else 1,
+            "seconds": seconds,
+            "mb_per_s": size / 1024 / 1024 / seconds if seconds > 0 else 0.0
+        })
+    return merge_dictionary_chunks(chunks)
+
+
+def read_compressed_dictionary(path, stats=None):
+    """边解压边解析压缩词库, 不在磁盘上生成解压后的文件
+
+    每次解压 STREAM_BLOCK_SIZE 字节, 在不位于引号字段内部的最后一个换行处截断,
+    截断前的部分直接解析, 剩余部分并入下一块.
+    """
+    started = time.perf_counter()
+    chunks = []
+    size = 0
+    with open_compressed(path) as raw:
+        pending = b""
+        while True:
+            block = raw.read(STREAM_BLOCK_SIZE)
+            size += len(block)
+            data = pending + block
+            if not block:
+                if data:
+                    chunks.append(parse_dictionary_text(data.decode("utf-8")))
+                break
+
+            cut = data.rfind(b"\n") + 1
+            while cut > 0 and data.count(b'"', 0, cut) % 2:
+                cut = data.rfind(b"\n", 0, cut - 1) + 1
+            if cut > 0:
+                chunks.append(parse_dictionary_text(data[:cut].decode("utf-8")))
+            pending = data[cut:]
+
+    if stats is not None:
+        seconds = time.perf_counter() - started
+        stats.update({
+            "bytes": size,
+            "compressed_bytes": os.path.getsize(path),
+            "chunks": len(chunks),
+            "workers": 1,
+            "seconds": seconds,
+            "mb_per_s": size / 1024 / 1024 / seconds if seconds > 0 else 0.0
+        })
+    return merge_dictionary_chunks(chunks)
+
+
+def merge_dictionary_chunks(chunks):
+    """按块的顺序合并解析结果, 返回 (单词列表, 释义字典, 词频字典)"""
+    # 重复单词以第一次出现为准:
+    # 倒序写入字典, 较早出现的值最后写入并覆盖较晚的值
+    words = list(dict.fromkeys(word for chunk in chunks for word in chunk[0]))
+    meanings = {}
+    frequencies = {}
+    for chunk_words, chunk_meanings, chunk_frequencies in reversed(chunks):
+        meanings.update(zip(reversed(chunk_words), reversed(chunk_meanings)))
+        frequencies.update(reversed(chunk_frequencies))
+    return words, meanings, frequencies
+
+
+def open_compressed(path):
+    """按扩展名打开压缩文件, 返回解压后的二进制流"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".xz") and lzma is not None:
+        return lzma.open(path, "rb")
+    if path.endswith(".zst") and zstandard is not None:
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    raise ValueError(f"不支持的压缩格式: {path}")
+
+
+def compress_dictionary(source, target=None):
+    """把 CSV 词库压缩成随程序附带的词库文件, 默认使用 COMPRESSED_SUFFIXES 中的第一种格式
+
+        python -c "import worldless; worldless.compress_dictionary('EnWords.csv')"
+    """
+    target = target or source + COMPRESSED_SUFFIXES[0]
+    tmp_path = target + ".tmp"
+    with open(source, "rb") as src, open(tmp_path, "wb") as dst:
+        if target.endswith(".zst") and zstandard is not None:
+            out = zstandard.ZstdCompressor(level=19).stream_writer(dst, closefd=False)
+        elif target.endswith(".xz") and lzma is not None:
+            out = lzma.LZMAFile(dst, "wb", preset=9 | lzma.PRESET_EXTREME)
+        elif target.endswith(".gz"):
+            out = gzip.GzipFile(fileobj=dst, mode="wb", compresslevel=9, mtime=0)
+        else:
+            raise ValueError(f"不支持的压缩格式: {target}")
+        with out:
+            while True:
+                block = src.read(1024 * 1024)
+                if not block:
+                    break
+                out.write(block)
+    os.replace(tmp_path, target)
+    return target
+
+
+def find_bundled_dictionary(name="EnWords.csv"):
+    """返回随程序附带的压缩词库路径, 没有时返回 None"""
+    for suffix in COMPRESSED_SUFFIXES:
+        path = os.path.join(BUNDLED_DICT_DIR, name + suffix)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def encode_game_code(word, attempts):
+    game_data = f"{word}{GAME_CODE_SEPARATOR}{attempts}"
+    return base64.b64encode(game_data.encode("utf-8")).decode("utf-8")
+
+
+def decode_game_code(code):
+    """解码游戏代码, 返回 (单词, 尝试次数), 不检查单词是否在词库中"""
+    decoded = base64.b64decode(code).decode("utf-8")
+    parts = decoded.split(GAME_CODE_SEPARATOR)
+
+    if len(parts) != 2:
+        raise ValueError("无效的游戏代码格式")
+
+    return parts[0].strip().lower(), int(parts[1].strip())
+
+
+def encode_feedback(codes):
+    """把 "20100" 形式的结果编码成三进制整数, 第 i 位对应第 i 个字母"""
+    value = 0
+    for i, code in enumerate(codes):
+        value += int(code) * 3 ** i
+    return value
+
+
+def feedback_array(words, guess):
+    """对 (n, L) 的 uint8 字母矩阵中的每个单词计分, 返回 encode_feedback 编码的数组(需要 NumPy)"""
+    letters = guess.encode("ascii")
+    green = words == np.frombuffer(letters, dtype=np.uint8)
+    not_green = ~green
+    weights = 3 ** np.arange(len(letters), dtype=np.int64)
+    result = (green * (2 * weights)).sum(axis=1)
+
+    # 黄色: 从左到右, 该字母在非绿色位置上还有剩余时标记
+    available = {}
+    used = {}
+    for i, char in enumerate(letters):
+        if char not in available:
+            available[char] = ((words == char) & not_green).sum(axis=1)
+            used[char] = np.zeros(len(words), dtype=np.int64)
+        yellow = not_green[:, i] & (used[char] < available[char])
+        used[char] += yellow
+        result += yellow * weights[i]
+    return result
+
+
+class WordMatrix:
+    """同一长度的全部单词, 按字典序存成 (单词数, 长度) 的 uint8 矩阵
+
+    没有 NumPy 时 data 为 None, 只使用连续字节 flat. 缓冲区可以直接来自 mmap.
+    """
+
+    __slots__ = ("length", "count", "flat", "data", "keys")
+
+    def __init__(self, length, buffer, count):
+        self.length:int = length
+        self.count:int = count
+        self.flat = memoryview(buffer).cast("B")[:count * length]
+        if np is not None:
+            self.data = np.frombuffer(self.flat, dtype=np.uint8).reshape(count, length)
+            # 每行看作一个定长字节串, 用于二分查找
+            self.keys = np.frombuffer(self.flat, dtype=f"S{length}", count=count)
+        else:
+            self.data = None
+            self.keys = None
+
+    @classmethod
+    def from_words(cls, length, words):
+        unique = sorted(set(words))
+        return cls(length, "".join(unique).encode("ascii"), len(unique))
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("单词下标越界")
+        start = i * self.length
+        return self.flat[start:start + self.length].tobytes().decode("ascii")
+
+    def __iter__(self):
+        text = self.flat.tobytes().decode("ascii")
+        length = self.length
+        for start in range(0, len(text), length):
+            yield text[start:start + length]
+
+    def __contains__(self, word):
+        return self.index(word) >= 0
+
+    def index(self, word):
+        """二分查找单词的下标, 不存在时返回 -1"""
+        if len(word) != self.length:
+            return -1
+        try:
+            key = word.encode("ascii")
+        except UnicodeEncodeError:
+            return -1
+
+        if self.keys is not None:
+            i = int(np.searchsorted(self.keys, key))
+            return i if i < self.count and self.keys[i] == key else -1
+
+        flat = self.flat
+        length = self.length
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if flat[mid * length:(mid + 1) * length].tobytes() < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and flat[lo * length:(lo + 1) * length].tobytes() == key:
+            return lo
+        return -1
+
+    def feedback_codes(self, guess):
+        """用同一猜测对全部单词计分, 返回 encode_feedback 编码后的结果"""
+        if self.data is None or not self.count:
+            return [encode_feedback(score_guess(guess, word)) for word in self]
+        return feedback_array(self.data, guess)
+
+
+class WordStore:
+    """词库的规范存储: 每个长度一个 WordMatrix, 释义和词频按相同顺序存放"""
+
+    __slots__ = ("buckets", "meaning_blobs", "meaning_offsets", "frequencies", "mapping")
+
+    def __init__(self):
+        self.buckets:dict = {}  # 长度 -> WordMatrix
+        self.meaning_blobs:dict = {}  # 长度 -> UTF-8 释义拼接
+        self.meaning_offsets:dict = {}  # 长度 -> 每个释义的起始位置(多一个结尾)
+        self.frequencies:dict = {}  # 长度 -> 词频(没有词频列时不存在)
+        self.mapping = None  # 从缓存加载时保持 mmap 打开
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    def __contains__(self, word):
+        bucket = self.buckets.get(len(word))
+        return bucket is not None and bucket.index(word) >= 0
+
+    def __iter__(self):
+        for length in sorted(self.buckets):
+            yield from self.buckets[length]
+
+    def meaning_at(self, length, i):
+        offsets = self.meaning_offsets[length]
+        return bytes(self.meaning_blobs[length][offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+    def frequency_at(self, length, i):
+        frequencies = self.frequencies.get(length)
+        if frequencies is None or math.isnan(frequencies[i]):
+            return None
+        return frequencies[i]
+
+    @classmethod
+    def build(cls, words, meanings, frequencies):
+        """由读取的单词、释义和词频构建存储, 重复单词只保留一份"""
+        store = cls()
+        by_length = {}
+        for word in words:
+            by_length.setdefault(len(word), []).append(word)
+
+        for length, group in by_length.items():
+            matrix = WordMatrix.from_words(length, group)
+            store.buckets[length] = matrix
+
+            parts = [meanings.get(word, "").replace("\n", " ").encode("utf-8") for word in matrix]
+            offsets = array("I", [0])
+            for part in parts:
+                offsets.append(offsets[-1] + len(part))
+            store.meaning_blobs[length] = b"".join(parts)
+            store.meaning_offsets[length] = offsets
+
+            if frequencies:
+                store.frequencies[length] = array("f", [frequencies.get(word, math.nan) for word in matrix])
+        return store
+
+    def save(self, path, source_path):
+        """写入缓存文件: 头部 JSON 记录各段位置, 数据段按 8 字节对齐"""
+        sections = []
+        offset = 0
+        header = {"byteorder": sys.byteorder, "source": source_signature(source_path), "buckets": []}
+
+        def add(data):
+            nonlocal offset
+            start = offset
+            sections.append(data)
+            offset += len(data)
+            padding = -offset % 8
+            sections.append(b"\0" * padding)
+            offset += padding
+            return start
+
+        for length in sorted(self.buckets):
+            matrix = self.buckets[length]
+            entry = {
+                "length": length,
+                "count": len(matrix),
+                "words": add(matrix.flat.tobytes()),
+                "offsets": add(self.meaning_offsets[length].tobytes()),
+                "meanings": add(bytes(self.meaning_blobs[length])),
+                "meanings_size": len(self.meaning_blobs[length])
+            }
+            if length in self.frequencies:
+                entry["frequencies"] = add(array("f", self.frequencies[length]).tobytes())
+            header["buckets"].append(entry)
+
+        header_bytes = json.dumps(header).encode("utf-8")
+        prefix = CACHE_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes
+        prefix += b"\0" * (-len(prefix) % 8)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(prefix)
+            for data in sections:
+                f.write(data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, source_path=None):
+        """通过 mmap 加载缓存, 不复制单词数据; 缓存过期或损坏时返回 None"""
+        try:
+            with open(path, "rb") as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            if mapping[:4] != CACHE_MAGIC:
+                return None
+            header_size = struct.unpack("<I", mapping[4:8])[0]
+            header = json.loads(mapping[8:8 + header_size].decode("utf-8"))
+            if header.get("byteorder") != sys.byteorder:
+                return None
+            if source_path is not None and header.get("source") != source_signature(source_path):
+                return None
+
+            base = 8 + header_size
+            base += -base % 8
+            view = memoryview(mapping)
+            store = cls()
+            store.mapping = mapping
+            for entry in header["buckets"]:
+                length, count = entry["length"], entry["count"]
+                words_at = base + entry["words"]
+                store.buckets[length] = WordMatrix(length, view[words_at:words_at + count * length], count)
+                offsets_at = base + entry["offsets"]
+                store.meaning_offsets[length] = view[offsets_at:offsets_at + 4 * (count + 1)].cast("I")
+                meanings_at = base + entry["meanings"]
+                store.meaning_blobs[length] = view[meanings_at:meanings_at + entry["meanings_size"]]
+                if "frequencies" in entry:
+                    frequencies_at = base + entry["frequencies"]
+                    store.frequencies[length] = view[frequencies_at:frequencies_at + 4 * count].cast("f")
+            return store
+        except (ValueError, KeyError, TypeError, struct.error):
+            return None
+
+
+def save_bucket_sections(path, magic, store, sections):
+    """写入按长度分段的辅助文件 (难度评分、拼写提示索引)
+
+    sections 为 {长度: [array, ...]}, 每个 array 与该长度的单词一一对应.
+    头部 JSON 记录每个长度的单词数和单词矩阵的 crc32, 之后依次是各段数据.
+    """
+    header = {"buckets": []}
+    blobs = []
+    for length in sorted(sections):
+        bucket = store.buckets[length]
+        header["buckets"].append({
+            "length": length,
+            "count": len(bucket),
+            "digest": zlib.crc32(bucket.flat)
+        })
+        blobs.extend(section.tobytes() for section in sections[length])
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(magic + struct.pack("<I", len(header_bytes)) + header_bytes)
+        for data in blobs:
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_bucket_sections(path, magic, store, layout):
+    """读取 save_bucket_sections 写入的文件, 返回 {长度: [array, ...]}
+
+    layout(长度) 返回该长度各段的 array 类型码. 只保留单词列表与当前词库一致的长度;
+    某段长度不足时说明文件被截断, 该长度及之后的长度全部丢弃.
+    """
+    sections = {}
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != magic:
+            return sections
+        header_size = struct.unpack("<I", data[4:8])[0]
+        header = json.loads(data[8:8 + header_size].decode("utf-8"))
+        position = 8 + header_size
+        for entry in header["buckets"]:
+            length, count = entry["length"], entry["count"]
+            arrays = []
+            for typecode in layout(length):
+                section = array(typecode)
+                size = count * section.itemsize
+                section.frombytes(data[position:position + size])
+                position += size
+                if len(section) != count:
+                    return sections
+                arrays.append(section)
+            bucket = store.buckets.get(length)
+            if bucket is not None and len(bucket) == count and zlib.crc32(bucket.flat) == entry["digest"]:
+                sections[length] = arrays
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        pass
+    return sections
+
+
+class DifficultyRatings:
+    """离线计算的单词难度, 与 WordStore 中每个长度的单词顺序一一对应
+
+    guesses 为参考解法猜中该词需要的次数, traps 为只差一个字母的同类词数量("_ight" 陷阱).
+    """
+
+    __slots__ = ("guesses", "traps")
+
+    def __init__(self):
+        self.guesses:dict = {}  # 长度 -> 每个单词的猜测次数
+        self.traps:dict = {}  # 长度 -> 每个单词的陷阱词数量
+
+    def __contains__(self, length):
+        return length in self.guesses
+
+    def rating_at(self, length, i):
+        """综合难度: 猜测次数加上陷阱词数量的对数"""
+        return self.guesses[length][i] + math.log2(1 + self.traps[length][i])
+
+    def rating_of(self, store, word):
+        bucket = store.buckets.get(len(word))
+        i = bucket.index(word) if bucket is not None else -1
+        if i < 0 or len(word) not in self:
+            return None
+        return self.rating_at(len(word), i)
+
+    def save(self, path, store):
+        save_bucket_sections(path, RATING_MAGIC, store, {
+            length: [array("B", self.guesses[length]), array("H", self.traps[length])]
+            for length in self.guesses
+        })
+
+    @classmethod
+    def load(cls, path, store):
+        ratings = cls()
+        for length, (guesses, traps) in load_bucket_sections(path, RATING_MAGIC, store,
+                                                             lambda length: "BH").items():
+            ratings.guesses[length] = guesses
+            ratings.traps[length] = traps
+        return ratings
+
+
+class SuggestionIndex:
+    """按汉明距离查找同一长度中相近的单词, 用于提示拼错的猜测
+
+    单词分成 MAX_DISTANCE + 1 段, 距离不超过 MAX_DISTANCE 的两个单词至少有一段完全相同.
+    每段保存按该段字母排序的单词下标, 查询时二分找出该段相同的候选词, 再逐个核对距离.
+    """
+
+    MAX_DISTANCE = 2
+
+    __slots__ = ("orders",)
+
+    def __init__(self):
+        self.orders:dict = {}  # 长度 -> 每段排序后的单词下标
+
+    def __contains__(self, length):
+        return length in self.orders
+
+    @classmethod
+    def segments(cls, length):
+        """把 length 个位置尽量均分成 MAX_DISTANCE + 1 段, 返回 [(起, 止), ...]"""
+        parts = cls.MAX_DISTANCE + 1
+        size, extra = divmod(length, parts)
+        bounds = []
+        start = 0
+        for i in range(parts):
+            end = start + size + (1 if i < extra else 0)
+            bounds.append((start, end))
+            start = end
+        return bounds
+
+    @classmethod
+    def build_orders(cls, bucket):
+        """为一个长度的单词构建各段的排序下标"""
+        flat = bucket.flat.tobytes()
+        length = bucket.length
+        orders = []
+        for start, end in cls.segments(length):
+            if bucket.data is not None:
+                # 每段最多 4 个字母, 拼成一个整数后排序
+                keys = np.zeros(len(bucket), dtype=np.uint32)
+                for column in range(start, end):
+                    keys = (keys << 8) | bucket.data[:, column]
+                orders.append(array("I", np.argsort(keys, kind="stable").astype(np.uint32).tobytes()))
+            else:
+                orders.append(array("I", sorted(
+                    range(len(bucket)), key=lambda i: flat[i * length + start:i * length + end]
+                )))
+        return orders
+
+    @staticmethod
+    def bound(flat, length, order, start, end, part, upper):
+        """在按段排序的下标中二分查找 part 的左边界(upper 为 True 时为右边界)"""
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            i = order[mid] * length
+            value = flat[i + start:i + end].tobytes()
+            if value < part or (upper and value == part):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def suggest(self, store, word, limit=3):
+        """返回与 word 长度相同、距离最近的若干单词, 距离相同时常见词在前"""
+        length = len(word)
+        bucket = store.buckets.get(length)
+        orders = self.orders.get(length)
+        if bucket is None or orders is None:
+            return []
+        try:
+            key = word.encode("ascii")
+        except UnicodeEncodeError:
+            return []
+
+        candidates = []
+        for (start, end), order in zip(self.segments(length), orders):
+            part = key[start:end]
+            lo = self.bound(bucket.flat, length, order, start, end, part, False)
+            hi = self.bound(bucket.flat, length, order, start, end, part, True)
+            candidates.append(order[lo:hi])
+
+        if bucket.data is not None:
+            # 在多段都相同的单词会重复出现, 过滤距离后再去重
+            indices = np.concatenate([np.frombuffer(c, dtype=np.uint32) for c in candidates])
+            distances = (bucket.data[indices] != np.frombuffer(key, dtype=np.uint8)).sum(axis=1)
+            close = (distances > 0) & (distances <= self.MAX_DISTANCE)
+            matches = list(set(zip(distances[close].tolist(), indices[close].tolist())))
+        else:
+            matches = []
+            for i in set(itertools.chain.from_iterable(candidates)):
+                other = bucket.flat[i * length:(i + 1) * length]
+                distance = sum(a != b for a, b in zip(key, other))
+                if 0 < distance <= self.MAX_DISTANCE:
+                    matches.append((distance, i))
+
+        matches.sort(key=lambda match: (match[0], -(store.frequency_at(length, match[1]) or 0.0), match[1]))
+        return [bucket[i] for _, i in matches[:limit]]
+
+    def save(self, path, store):
+        save_bucket_sections(path, SUGGEST_MAGIC, store, self.orders)
+
+    @classmethod
+    def load(cls, path, store):
+        index = cls()
+        index.orders = load_bucket_sections(path, SUGGEST_MAGIC, store,
+                                            lambda length: "I" * len(cls.segments(length)))
+        return index
+
+
+class MeaningTable:
+    """按单词查释义, 接口与 dict.get 相同, 释义在查询时才解码"""
+
+    __slots__ = ("store",)
+
+    def __init__(self, store):
+        self.store = store
+
+    def get(self, word, default=""):
+        bucket = self.store.buckets.get(len(word))
+        i = bucket.index(word) if bucket is not None else -1
+        return self.store.meaning_at(len(word), i) if i >= 0 else default
+
+
+def source_signature(path):
+    """源文件的大小和修改时间, 用于判断缓存是否过期"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def letter_counts(word):
+    counts = {}
+    for char in word:
+        counts[char] = counts.get(char, 0) + 1
+    return counts
+
+
+def score_guess_batch(guess, targets, target_counts=None):
+    """用同一个猜测批量计算多个目标词的结果, target_counts 为预先统计好的字母计数"""
+    if target_counts is None:
+        target_counts = [letter_counts(target) for target in targets]
+
+    length = len(guess)
+    solved = "2" * length
+    results = []
+    for target, counts in zip(targets, target_counts):
+        if guess == target:
+            results.append(solved)
+            continue
+
+        remaining = dict(counts)
+        codes = ["0"] * length
+        for i in range(length):
+            if guess[i] == target[i]:
+                codes[i] = "2"
+                remaining[guess[i]] -= 1
+        for i in range(length):
+            char = guess[i]
+            if codes[i] == "0" and remaining.get(char, 0) > 0:
+                codes[i] = "1"
+                remaining[char] -= 1
+        results.append("".join(codes))
+    return results
+
+
+class Animation:
+    """由关键帧组成的动画, 每个目标一条轨道 [(时间, 属性), ...]
+
+    目标可以是控件, 也可以是 (canvas, item_id). 每帧只输出比上次更新的关键帧,
+    跳过的关键帧属性会合并, 所以丢帧时直接跳到正确状态.
+    """
+
+    __slots__ = ("tracks", "emitted", "duration", "start")
+
+    def __init__(self, tracks):
+        self.tracks:list = [(target, sorted(keys, key=lambda k: k[0])) for target, keys in tracks if keys]
+        self.emitted:list = [-1] * len(self.tracks)
+        self.duration:float = max((keys[-1][0] for _, keys in self.tracks), default=0.0)
+        self.start:float = 0.0
+
+    def frame(self, elapsed, changes):
+        """把 elapsed 时刻需要改变的属性写入 changes, 动画结束时返回 True"""
+        for k, (target, keys) in enumerate(self.tracks):
+            index = self.emitted[k]
+            if index + 1 >= len(keys) or keys[index + 1][0] > elapsed:
+                continue
+
+            entry = changes.get(target)
+            if entry is None:
+                entry = changes[target] = {}
+            while index + 1 < len(keys) and keys[index + 1][0] <= elapsed:
+                index += 1
+                entry.update(keys[index][1])
+            self.emitted[k] = index
+        return elapsed >= self.duration
+
+
+class AnimationScheduler:
+    """所有动画共用一个帧时钟, 每帧把颜色变化合并后一次性应用"""
+
+    def __init__(self, root, fps=60):
+        self.root = root
+        self.interval:float = 1.0 / fps
+        self.animations:list = []
+        self.after_id = None
+        self.next_frame:float = 0.0
+        self.frame_times = deque(maxlen=1000)  # 每帧应用变化耗时(秒)
+        self.dropped_frames:int = 0
+
+    def add(self, animation):
+        animation.start = time.perf_counter()
+        self.animations.append(animation)
+        if self.after_id is None:
+            self.next_frame = animation.start
+            self.after_id = self.root.after(0, self.tick)
+        return animation
+
+    def clear(self):
+        # 网格重建前丢弃所有未完成的动画
+        self.animations = []
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def tick(self):
+        now = time.perf_counter()
+
+        # 系统跟不上时不补帧, 只记录丢了多少帧
+        late = now - self.next_frame
+        if late > self.interval:
+            self.dropped_frames += int(late / self.interval)
+
+        # 收集本帧所有变化, 同一目标只配置一次
+        changes = {}
+        running = []
+        for animation in self.animations:
+            if not animation.frame(now - animation.start, changes):
+                running.append(animation)
+        self.animations = running
+
+        for target, options in changes.items():
+            try:
+                if isinstance(target, tuple):
+                    target[0].itemconfigure(target[1], **options)
+                else:
+                    target.configure(**options)
+            except tk.TclError:
+                pass  # 控件已被销毁
+
+        finished = time.perf_counter()
+        self.frame_times.append(finished - now)
+
+        if self.animations:
+            self.next_frame = now + self.interval
+            delay = max(1, int((self.next_frame - finished) * 1000))
+            self.after_id = self.root.after(delay, self.tick)
+        else:
+            self.after_id = None
+
+    def stats(self):
+        """返回帧耗时 p50/p99(毫秒)和丢帧数"""
+        times = sorted(self.frame_times)
+        if not times:
+            return {"frames": 0, "p50": 0.0, "p99": 0.0, "max": 0.0, "dropped": self.dropped_frames}
+        return {
+            "frames": len(times),
+            "p50": times[len(times) // 2] * 1000,
+            "p99": times[min(len(times) - 1, int(len(times) * 0.99))] * 1000,
+            "max": times[-1] * 1000,
+            "dropped": self.dropped_frames
+        }
+
+
+def reveal_tracks(cells, colors, option="bg", delay=0.0, stagger=0.08, flip=0.12, flip_color="#3A3A3C"):
+    """翻牌效果: 每个格子依次先变暗再显示结果颜色"""
+    tracks = []
+    for i, (cell, color) in enumerate(zip(cells, colors)):
+        start = delay + i * stagger
+        tracks.append((cell, [
+            (start, {option: flip_color}),
+            (start + flip / 2, {option: color})
+        ]))
+    return tracks
+
+
+def shake_tracks(cells, option, color, rest_color, duration=0.3, step=0.05):
+    """抖动效果: 边框在警告色和原色之间快速切换"""
+    keys = []
+    t = 0.0
+    flag = True
+    while t < duration:
+        keys.append((t, {option: color if flag else rest_color}))
+        flag = not flag
+        t += step
+    keys.append((duration, {option: rest_color}))
+    return [(cell, list(keys)) for cell in cells]
+
+
+def win_tracks(grid_colors, delay=0.0, flash=0.1, wave=1.5):
+    """胜利效果: 从左上角开始波浪式闪白后恢复原色"""
+    rows = len(grid_colors)
+    cols = max((len(row) for row in grid_colors), default=0)
+    step = min(0.03, wave / max(1, rows + cols))
+    tracks = []
+    for r, row in enumerate(grid_colors):
+        for c, (cell, color) in enumerate(row):
+            start = delay + (r + c) * step
+            tracks.append((cell, [(start, {"bg": "#FFFFFF"}), (start + flash, {"bg": color})]))
+    return tracks
+
+
+def benchmark_animation(rows=200, cols=12, fps=60):
+    """在 rows x cols 的最大网格上运行翻牌和胜利动画并打印帧耗时
+
+    python -c "import worldless; worldless.benchmark_animation()"
+    """
+    root = tk.Tk()
+    root.title("animation benchmark")
+    frame = tk.Frame(root)
+    frame.pack()
+    grid = []
+    for r in range(rows):
+        row = []
+        for c in range(cols):
+            label = tk.Label(frame, text="A", width=2, bg="#121213", fg="#D7DADC",
+                             highlightthickness=2, highlightbackground="#3A3A3C")
+            label.grid(row=r, column=c)
+            row.append(label)
+        grid.append(row)
+    root.update()
+
+    scheduler = AnimationScheduler(root, fps)
+    palette = ("#6AAA64", "#C9B458", "#787C7E")
+    colors = [[palette[(r + c) % 3] for c in range(cols)] for r in range(rows)]
+    scheduler.add(Animation(reveal_tracks(grid[-1], colors[-1], stagger=0.02)))
+    scheduler.add(Animation(win_tracks(
+        [list(zip(grid[r], colors[r])) for r in range(rows)], delay=0.3
+    )))
+
+    def wait():
+        if scheduler.animations:
+            root.after(50, wait)
+        else:
+            root.destroy()
+
+    root.after(50, wait)
+    root.mainloop()
+
+    stats = scheduler.stats()
+    print(f"{rows}x{cols}: {stats['frames']} 帧, 帧耗时 p50 {stats['p50']:.2f}ms, "
+          f"p99 {stats['p99']:.2f}ms, 最大 {stats['max']:.2f}ms, 丢帧 {stats['dropped']}")
+    return stats
+
+
+def letter_vector(word):
+    """26 个字母的计数向量"""
+    counts = bytearray(26)
+    for char in word:
+        counts[ord(char) - 97] += 1
+    return bytes(counts)
+
+
+class AnagramIndex:
+    """按排序字母签名索引词库, 支持变位词和"用这些字母能拼出哪些词"查询
+
+    不另存单词, 只记录每个签名对应 WordStore 中哪些行:
+    signatures[长度] 是排好序的签名矩阵, 第 k 个签名的单词为
+    rows[长度][starts[长度][k]:starts[长度][k + 1]].
+    所有签名的 26 字母计数向量按长度顺序存在一块连续缓冲区 vectors 中,
+    长度 L 的签名从第 vector_starts[L] 个向量开始.
+    """
+
+    __slots__ = ("store", "signatures", "starts", "rows", "vectors", "vector_starts")
+
+    # 子多重集数量不超过此值时逐个查找签名, 否则扫描全部计数向量;
+    # 逐个查找一次签名的开销约等于扫描几百个向量
+    MAX_ENUMERATION = 256
+
+    def __init__(self, store):
+        self.store = store
+        self.signatures:dict = {}  # 长度 -> 签名的 WordMatrix
+        self.starts:dict = {}  # 长度 -> 每个签名在 rows 中的起始位置(多一个结尾)
+        self.rows:dict = {}  # 长度 -> 按签名分组的单词行号
+        self.vector_starts:dict = {}  # 长度 -> 该长度第一个签名的向量序号
+        vectors = []
+        count = 0
+        for length in sorted(store.buckets):
+            matrix = store.buckets[length]
+            if matrix.data is not None:
+                signatures, starts, rows, counts = self.group_numpy(matrix)
+            else:
+                signatures, starts, rows, counts = self.group_python(matrix)
+            self.signatures[length] = signatures
+            self.starts[length] = starts
+            self.rows[length] = rows
+            self.vector_starts[length] = count
+            vectors.append(counts)
+            count += len(signatures)
+        self.vectors = b"".join(vectors)
+
+    @staticmethod
+    def group_numpy(matrix):
+        length, count = matrix.length, len(matrix)
+        keys = np.sort(matrix.data, axis=1).view(f"S{length}").ravel()
+        order = np.argsort(keys, kind="stable")
+        unique, first = np.unique(keys[order], return_index=True)
+        signatures = WordMatrix(length, unique.tobytes(), len(unique))
+        starts = array("I", np.append(first, count).astype(np.uint32).tobytes())
+        rows = array("I", order.astype(np.uint32).tobytes())
+        counts = np.zeros((len(unique), 26), dtype=np.uint8)
+        index = np.arange(len(unique))
+        for column in signatures.data.T:
+            counts[index, column - 97] += 1
+        return signatures, starts, rows, counts.tobytes()
+
+    @staticmethod
+    def group_python(matrix):
+        pairs = sorted(("".join(sorted(word)), i) for i, word in enumerate(matrix))
+        signatures = WordMatrix.from_words(matrix.length, [signature for signature, _ in pairs])
+        starts = array("I")
+        rows = array("I", [i for _, i in pairs])
+        previous = None
+        for position, (signature, _) in enumerate(pairs):
+            if signature != previous:
+                starts.append(position)
+                previous = signature
+        starts.append(len(pairs))
+        counts = b"".join(letter_vector(signature) for signature in signatures)
+        return signatures, starts, rows, counts
+
+    def words_of(self, length, k):
+        """第 k 个签名对应的单词, 按字母顺序"""
+        bucket = self.store.buckets[length]
+        starts = self.starts[length]
+        return [bucket[row] for row in self.rows[length][starts[k]:starts[k + 1]]]
+
+    def lookup(self, signature):
+        signatures = self.signatures.get(len(signature))
+        k = signatures.index(signature) if signatures is not None else -1
+        return self.words_of(len(signature), k) if k >= 0 else []
+
+    def anagrams(self, letters):
+        return self.lookup("".join(sorted(letters.lower())))
+
+    def buildable(self, letters, min_length=3):
+        """返回能用给定字母(每个字母最多用给定次数)拼出的所有单词, 长的在前"""
+        letters = "".join(sorted(c for c in letters.lower() if "a" <= c <= "z"))
+        groups = [(char, len(list(run))) for char, run in itertools.groupby(letters)]
+
+        combinations = 1
+        for _, count in groups:
+            combinations *= count + 1
+
+        results = []
+        if combinations <= self.MAX_ENUMERATION:
+            # 枚举所有子多重集, 每个子集按字母顺序拼接正好是签名
+            for picks in itertools.product(*(range(count + 1) for _, count in groups)):
+                if sum(picks) < min_length:
+                    continue
+                results.extend(self.lookup("".join(char * k for (char, _), k in zip(groups, picks))))
+        else:
+            # 只有不超过给定字母数的长度才可能拼出
+            lengths = [length for length in self.signatures if min_length <= length <= len(letters)]
+            for length, k in self.scan(letter_vector(letters), lengths):
+                results.extend(self.words_of(length, k))
+
+        results.sort(key=lambda word: (-len(word), word))
+        return results
+
+    def scan(self, available, lengths):
+        """逐个检查计数向量, 返回不超过 available 的签名 (长度, 序号)"""
+        for length in lengths:
+            first = self.vector_starts[length]
+            total = len(self.signatures[length])
+            if np is not None:
+                counts = np.frombuffer(self.vectors, dtype=np.uint8, count=total * 26,
+                                       offset=first * 26).reshape(total, 26)
+                limit = np.frombuffer(available, dtype=np.uint8)
+                for k in np.nonzero((counts <= limit).all(axis=1))[0].tolist():
+                    yield length, k
+                continue
+            for k in range(total):
+                start = (first + k) * 26
+                if all(a <= b for a, b in zip(self.vectors[start:start + 26], available)):
+                    yield length, k
+
+
+class HardModeConstraints:
+    """困难模式的已知约束: 绿色字母的位置掩码和每个字母的最少出现次数"""
+
+    __slots__ = ("fixed", "fixed_mask", "min_counts")
+
+    def __init__(self, word_length):
+        self.fixed:list = [""] * word_length  # 每个位置必须出现的字母
+        self.fixed_mask:int = 0  # 已固定位置的位掩码
+        self.min_counts:dict = {}  # 字母 -> 至少出现次数
+
+    def update(self, guess, codes):
+        """根据一次猜测的结果收紧约束"""
+        revealed = {}
+        for i, (char, code) in enumerate(zip(guess, codes)):
+            if code == "2":
+                self.fixed[i] = char
+                self.fixed_mask |= 1 << i
+            if code != "0":
+                revealed[char] = revealed.get(char, 0) + 1
+        for char, count in revealed.items():
+            if count > self.min_counts.get(char, 0):
+                self.min_counts[char] = count
+
+    def check(self, guess):
+        """检查猜测是否满足约束, 不满足时返回提示信息"""
+        mask = self.fixed_mask
+        while mask:
+            i = (mask & -mask).bit_length() - 1
+            if guess[i] != self.fixed[i]:
+                return f"第 {i + 1} 个字母必须是 {self.fixed[i].upper()}"
+            mask &= mask - 1
+
+        for char, count in self.min_counts.items():
+            if guess.count(char) < count:
+                if count == 1:
+                    return f"猜测中必须包含 {char.upper()}"
+                return f"猜测中必须包含 {count} 个 {char.upper()}"
+        return None
+
+
+class MultiBoardView:
+    """多棋盘模式的画布渲染器, 每个棋盘一个 Canvas, 只为已用到的行创建图元"""
+
+    def __init__(self, parent, board_count, word_length, colors, scheduler=None):
+        self.scheduler = scheduler
+        self.board_count:int = board_count
+        self.word_length:int = word_length
+        self.colors:dict = colors
+
+        # 两列布局, 根据单词长度缩放格子大小
+        self.columns:int = 1 if board_count == 1 else 2
+        self.cell:int = max(14, min(36, (440 - 30 * self.columns) // (self.columns * word_length) - 2))
+        self.pitch:int = self.cell + 2
+        self.font = ("Microsoft YaHei", max(7, self.cell // 2), "bold")
+
+        self.frame = tk.Frame(parent, bg=colors["bg"])
+        self.frame.pack(padx=10, pady=10)
+
+        self.canvases:list = []
+        self.cells:list = []  # cells[board][row] = [(rect_id, text_id), ...]
+        self.row_text:list = []  # 每个棋盘当前输入行已显示的文字, 用于只更新变化的格子
+        for board in range(board_count):
+            canvas = tk.Canvas(
+                self.frame,
+                width=word_length * self.pitch,
+                height=self.pitch,
+                bg=colors["bg"],
+                highlightthickness=2,
+                highlightbackground=colors["border"]
+            )
+            canvas.grid(row=board // self.columns, column=board % self.columns, padx=5, pady=5, sticky="n")
+            self.canvases.append(canvas)
+            self.cells.append([])
+            self.row_text.append("")
+
+    def ensure_row(self, board, row):
+        """按需为棋盘创建到指定行为止的格子"""
+        canvas = self.canvases[board]
+        rows = self.cells[board]
+        while len(rows) <= row:
+            y = len(rows) * self.pitch + 1
+            items = []
+            for col in range(self.word_length):
+                x = col * self.pitch + 1
+                rect = canvas.create_rectangle(
+                    x, y, x + self.cell, y + self.cell,
+                    fill=self.colors["bg"], outline=self.colors["border"], width=2
+                )
+                text = canvas.create_text(
+                    x + self.cell // 2, y + self.cell // 2,
+                    text="", fill=self.colors["text"], font=self.font
+                )
+                items.append((rect, text))
+            rows.append(items)
+            self.row_text[board] = ""
+            canvas.configure(height=len(rows) * self.pitch)
+        return rows[row]
+
+    def set_input(self, boards, row, letters):
+        """在仍在进行的棋盘上显示当前输入, 只改动变化的格子"""
+        text = "".join(letters).upper()
+        for board in boards:
+            items = self.ensure_row(board, row)
+            shown = self.row_text[board]
+            canvas = self.canvases[board]
+            for col in range(self.word_length):
+                new = text[col] if col < len(text) else ""
+                old = shown[col] if col < len(shown) else ""
+                if new != old:
+                    canvas.itemconfigure(items[col][1], text=new)
+            self.row_text[board] = text
+
+    def paint_row(self, board, row, guess, codes, animate=True):
+        code_colors = {"2": self.colors["correct"], "1": self.colors["present"], "0": self.colors["absent"]}
+        canvas = self.canvases[board]
+        items = self.ensure_row(board, row)
+        for col, (rect, text) in enumerate(items):
+            canvas.itemconfigure(text, text=guess[col].upper(), fill="white")
+            if not (self.scheduler and animate):
+                canvas.itemconfigure(rect, fill=code_colors[codes[col]], outline=code_colors[codes[col]])
+        self.row_text[board] = ""
+
+        # 有调度器时用翻牌动画显示颜色
+        if self.scheduler and animate:
+            rects = [(canvas, rect) for rect, _ in items]
+            colors = [code_colors[code] for code in codes]
+            self.scheduler.add(Animation(
+                reveal_tracks(rects, colors, option="fill", flip_color=self.colors["border"])
+                + reveal_tracks(rects, colors, option="outline", flip_color=self.colors["border"])
+            ))
+
+    def mark_solved(self, board):
+        self.canvases[board].configure(highlightbackground=self.colors["correct"])
+
+    def reveal_answer(self, board, row, target):
+        """在未猜中的棋盘末尾用红色显示答案"""
+        canvas = self.canvases[board]
+        items = self.ensure_row(board, row)
+        for col, (rect, text) in enumerate(items):
+            canvas.itemconfigure(rect, fill="#FF6B6B", outline="#FF6B6B")
+            canvas.itemconfigure(text, text=target[col].upper(), fill="white")
+
+
+class GameHistory:
+    """只追加的游戏记录, 每局一行紧凑 JSON, 统计数据增量维护"""
+
+    def __init__(self, log_path=HISTORY_FILE, stats_path=STATS_FILE, flush_every=8):
+        self.log_path:str = log_path
+        self.stats_path:str = stats_path
+        self.flush_every:int = flush_every
+        self.pending:list = []  # 尚未写入磁盘的记录
+        self.offset:int = 0  # 统计数据已覆盖的日志字节数
+        self.stats:dict = {}
+        self.lock = threading.Lock()
+        self.load_stats()
+
+    def load_stats(self):
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            self.offset = int(saved.get("offset", 0))
+            self.stats = saved.get("stats", {})
+        except (OSError, ValueError):
+            self.offset = 0
+            self.stats = {}
+
+        try:
+            size = os.path.getsize(self.log_path)
+        except OSError:
+            size = 0
+
+        # 日志被截断或替换时从头重建, 否则只补读统计之后追加的部分
+        if size < self.offset:
+            self.offset = 0
+            self.stats = {}
+        if size > self.offset:
+            with open(self.log_path, "rb") as f:
+                f.seek(self.offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # 写了一半的记录
+                    self.offset += len(line)
+                    try:
+                        self.apply(json.loads(line))
+                    except ValueError:
+                        continue
+            self.save_stats()
+
+    def apply(self, record):
+        """把一条记录累加到总体和对应长度的统计中"""
+        won = bool(record.get("w"))
+        attempts = len(record.get("g", []))
+        settings = record.get("s", {})
+        length_key = str(settings.get("len", len(record.get("t", ""))))
+        if settings.get("boards", 1) > 1:
+            length_key += f"x{settings['boards']}"
+        for key in ("all", length_key):
+            entry = self.stats.setdefault(key, {
+                "played": 0, "won": 0, "streak": 0, "max_streak": 0, "dist": {}
+            })
+            entry["played"] += 1
+            if won:
+                entry["won"] += 1
+                entry["streak"] += 1
+                entry["max_streak"] = max(entry["max_streak"], entry["streak"])
+                entry["dist"][str(attempts)] = entry["dist"].get(str(attempts), 0) + 1
+            else:
+                entry["streak"] = 0
+
+    def append(self, record):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self.lock:
+            self.pending.append(line.encode("utf-8"))
+            self.apply(record)
+            if len(self.pending) >= self.flush_every:
+                self.flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self.flush_locked()
+
+    def flush_locked(self):
+        if not self.pending:
+            return
+        data = b"".join(self.pending)
+        try:
+            with open(self.log_path, "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            print(f"保存游戏记录失败: {e}")
+            return
+        self.pending = []
+        self.offset += len(data)
+        self.save_stats()
+
+    def save_stats(self):
+        tmp_path = self.stats_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"offset": self.offset, "stats": self.stats}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.stats_path)
+        except OSError as e:
+            print(f"保存统计数据失败: {e}")
+
+    def get(self, key="all"):
+        return self.stats.get(key, {"played": 0, "won": 0, "streak": 0, "max_streak": 0, "dist": {}})
+
+
+class AliasTable:
+    """Walker 别名表, 预处理 O(n), 每次按权重抽样 O(1)
+
+    prob 和 alias 存成 array("d")/array("I"), 每个单词共 12 字节.
+    """
+
+    __slots__ = ("prob", "alias")
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(np.sum(weights) if np is not None else sum(weights))
+        if n == 0 or total <= 0:
+            # 没有有效权重时退化为均匀分布
+            weights = [1.0] * n
+            total = float(n)
+
+        self.prob = array("d", bytes(8 * n))
+        self.alias = array("I", bytes(4 * n))
+
+        # Vose 算法: 把缩放后的概率分成不足 1 和超过 1 两组互相填补
+        if np is not None:
+            scaled = np.asarray(weights, dtype=np.float64) * (n / total)
+            small = np.nonzero(scaled < 1.0)[0].tolist()
+            large = np.nonzero(scaled >= 1.0)[0].tolist()
+            scaled = scaled.tolist()
+        else:
+            scaled = [w * n / total for w in weights]
+            small = [i for i, p in enumerate(scaled) if p < 1.0]
+            large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        for i in large + small:
+            self.prob[i] = 1.0
+
+    def __len__(self):
+        return len(self.prob)
+
+    def sample(self, rng=random):
+        i = int(rng.random() * len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+def word_weight(word, meaning, frequency, letter_freq, difficulty, rating=None):
+    """计算单词在指定难度下被选为目标词的权重"""
+    if difficulty == "随机":
+        return 1.0
+
+    if rating is not None:
+        # 有离线难度评分时直接使用, 评分越高越难
+        ease = 1.0 / max(rating, 1.0) ** 4
+    elif frequency is not None and frequency > 0:
+        # 词库带词频列时直接使用词频, 词频为 0 或负数按缺失处理
+        ease = frequency
+    else:
+        # 否则用字母常见度和释义长度估算: 常见词通常由常见字母组成且释义更多
+        commonness = sum(letter_freq.get(c, 0.0) for c in set(word)) / len(set(word))
+        ease = max(commonness, 1e-9) * (1.0 + math.log1p(len(meaning)))
+
+    return ease if difficulty == "简单" else 1.0 / ease
+
+
+def bucket_eases(store, ratings, length):
+    """用 NumPy 一次算出某个长度全部单词的容易程度, 与逐词调用 word_weight(..., "简单") 结果相同"""
+    matrix = store.buckets[length]
+    count = len(matrix)
+    if not count:
+        return np.zeros(0)
+    if length in ratings:
+        guesses = np.asarray(ratings.guesses[length], dtype=np.float64)
+        traps = np.asarray(ratings.traps[length], dtype=np.float64)
+        return 1.0 / np.maximum(guesses + np.log2(1 + traps), 1.0) ** 4
+
+    # 每个单词包含哪些字母(重复字母只算一次), 以及各字母出现在多少比例的单词中
+    present = np.zeros((count, 26), dtype=bool)
+    present[np.arange(count)[:, None], matrix.data - 97] = True
+    letter_freq = present.sum(axis=0) / count
+    commonness = (present * letter_freq).sum(axis=1) / present.sum(axis=1)
+
+    # 释义的字符数: 统计 UTF-8 中不是续字节的字节
+    blob = np.frombuffer(store.meaning_blobs[length], dtype=np.uint8)
+    starts = np.concatenate(([0], np.cumsum((blob & 0xC0) != 0x80)))
+    offsets = np.frombuffer(store.meaning_offsets[length], dtype=np.uint32)
+    chars = starts[offsets[1:]] - starts[offsets[:-1]]
+    eases = np.maximum(commonness, 1e-9) * (1.0 + np.log1p(chars))
+
+    frequencies = store.frequencies.get(length)
+    if frequencies is not None:
+        frequencies = np.frombuffer(frequencies, dtype=np.float32).astype(np.float64)
+        eases = np.where(frequencies > 0, frequencies, eases)  # NaN 不大于 0, 同样按缺失处理
+    return eases
+
+
 class WordleGame:
 
 
@@ -137,10 +1648,12 @@ class WordleGame:
        1. 本软件按"原样"提供，不提供任何形式的明示或暗示担保
        2. 作者不对因使用本软件而导致的任何损害或损失负责
        3. 用户使用本软件的风险完全由用户自行承担
-       4. 本软件不会收集、存储或传输任何用户数据
+       4. 本软件不会收集或传输任何用户数据, 游戏数据仅保存在本机
 
        隐私声明:
        - 本软件不会收集任何用户个人信息
+       - 游戏记录、统计和未完成的对局保存在程序目录下
+         (Wordle_history.jsonl, Wordle_stats.json, Wordle_save.json), 删除即可清除
        - 所有数据处理均在本地设备上进行
        - 不会上传任何数据到远程服务器
 
@@ -159,19 +1672,58 @@ class WordleGame:
         self.root.configure(bg="#121213")
 
         # 常量
-        self.DICT_URL:str = "https://gitee.com/yuxiqin/100000-english-words/raw/master/EnWords.csv"
+        self.DICT_URL:str = DICT_URL
         self.LOCAL_DICT:str = "EnWords.csv"
-        self.SEPARATOR:str = "::"
+        self.DICT_CACHE:str = "EnWords.wlc"
+        self.DICT_RATINGS:str = "EnWords.wld"  # 由 worldless_rating.py 生成
+        self.DICT_SUGGEST:str = "EnWords.wls"  # 拼写提示索引, 首次加载后在后台生成
+        self.SEPARATOR:str = GAME_CODE_SEPARATOR
 
         # 游戏状态
-        self.dictionary:list = []
-        self.word_meanings:dict = {}
+        self.dictionary:WordStore = WordStore()
+        self.word_meanings = MeaningTable(self.dictionary)
+        self.words_by_length:dict = {}  # 长度 -> WordMatrix
+        self.alias_tables:dict = {}  # (长度, "简单"/"困难") -> AliasTable
+        self.anagram_index = None
+        self.parse_summary:str = ""  # 本次从源文件解析词库的耗时和吞吐量, 使用缓存时为空
+        self.ratings = DifficultyRatings()
+        self.suggestions = SuggestionIndex()
+        self.difficulty:str = "随机"
+
+        # 多棋盘模式
+        self.board_count:int = 1
+        self.target_words:list = []  # 每个棋盘的目标词
+        self.target_counts:list = []  # 每个目标词的字母计数, 批量计分时复用
+        self.solved_boards:list = []
+        self.current_input:list = []  # 当前行已输入的字母
+        self.shown_input:str = ""  # 单棋盘当前行已显示的字母
+
+        # 输入缓冲: 按键、屏幕键盘和粘贴都先放入缓冲, 每帧统一处理一次
+        self.pending_input = deque()  # (字符, 按下时间)
+        self.input_after_id = None
+        self.last_input_flush:float = 0.0
+        self.input_latency = deque(maxlen=1000)  # 按键到绘制完成的延迟(秒)
+        self.event_time_offset = None  # perf_counter 与键盘事件时间戳(毫秒)之差
+        self.board_view = None
+        self.board_key_colors:list = []  # 每个棋盘各字母的键盘状态
+        self.key_images:dict = {}
         self.target_word:str = ""
         self.word_length:int = 5
         self.max_attempts:int = 6
         self.current_attempt:int = 0
         self.dictionary_loaded:bool = False  # 标记词库是否已加载
         self.won:bool = False
+        self.guesses:list = []  # 本局已提交的猜测
+        self.feedbacks:list = []  # 每次猜测对应的结果代码
+        self.game_start_time:float = time.time()
+        self.game_recorded:bool = False
+        self.resumed:bool = False  # 是否从存档恢复了未完成的游戏
+        self.snapshot_after = None  # 延迟写入存档的定时器
+        self.hard_mode:bool = False
+        self.constraints = HardModeConstraints(self.word_length)
+
+        # 游戏记录
+        self.history = GameHistory()
 
         # 颜色定义
         self.CORRECT_COLOR:str = "#6AAA64"  # 绿色
@@ -182,6 +1734,9 @@ class WordleGame:
         self.KEY_DEFAULT:str = "#818384"  # 键盘默认颜色
         self.TEXT_COLOR:str = "#D7DADC"  # 文字颜色
 
+        # 动画调度器
+        self.animator = AnimationScheduler(root)
+
         # 创建UI
         self.create_menu()
         self.create_game_grid()
@@ -191,14 +1746,210 @@ class WordleGame:
         # 用于线程通信的队列
         self.message_queue = queue.Queue()
 
+        # 先恢复上次未完成的游戏, 词库加载完成后再校验
+        self.restore_snapshot()
+
         # 加载词库
         self.load_dictionary()
 
         # 绑定键盘事件
         self.root.bind("<Key>", self.handle_key_press)
+        self.root.bind("<<Paste>>", self.paste_clipboard)
 
         # 定期检查消息队列
         self.root.after(100, self.process_queue)
+
+        # 关闭窗口时写入尚未保存的数据
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(30000, self.flush_history)
+
+    def on_close(self):
+        self.history.flush()
+        if self.snapshot_after is not None:
+            self.root.after_cancel(self.snapshot_after)
+            self.save_snapshot()
+        self.root.destroy()
+
+    def schedule_snapshot(self):
+        """提交猜测后延迟写入存档, 连续提交只写最后一次"""
+        if self.snapshot_after is not None:
+            self.root.after_cancel(self.snapshot_after)
+        self.snapshot_after = self.root.after(500, self.save_snapshot)
+
+    def save_snapshot(self):
+        self.snapshot_after = None
+        if self.end or not self.guesses:
+            return
+
+        snapshot = {
+            "v": 1,
+            "targets": self.target_words,
+            "len": self.word_length,
+            "max": self.max_attempts,
+            "diff": self.difficulty,
+            "hard": int(self.hard_mode and self.board_count == 1),
+            "guesses": self.guesses,
+            "feedbacks": self.feedbacks,
+            "solved": [int(solved) for solved in self.solved_boards],
+            "keys": ({c: color for c, color in self.key_colors.items() if color != self.KEY_DEFAULT}
+                     if self.board_count == 1 else self.board_key_colors),
+            "elapsed": round(time.time() - self.game_start_time, 1)
+        }
+
+        # 先写临时文件再替换, 避免中途退出留下损坏的存档
+        tmp_path = SAVE_FILE + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, SAVE_FILE)
+        except OSError as e:
+            print(f"保存游戏进度失败: {e}")
+
+    def discard_snapshot(self):
+        if self.snapshot_after is not None:
+            self.root.after_cancel(self.snapshot_after)
+            self.snapshot_after = None
+        try:
+            os.remove(SAVE_FILE)
+        except OSError:
+            pass
+
+    @staticmethod
+    def check_snapshot(snapshot):
+        """检查存档结构, 不合法时抛出 ValueError; 只有通过检查的存档才会用来重建界面"""
+        def is_word(word):
+            return isinstance(word, str) and len(word) == word_length and WORD_PATTERN.fullmatch(word)
+
+        def is_codes(codes):
+            return isinstance(codes, str) and len(codes) == word_length and not codes.strip("012")
+
+        def is_keys(keys):
+            return isinstance(keys, dict) and all(
+                isinstance(char, str) and isinstance(color, str) and COLOR_PATTERN.fullmatch(color)
+                for char, color in keys.items()
+            )
+
+        if not isinstance(snapshot, dict):
+            raise ValueError("存档格式错误")
+        targets = snapshot["targets"]
+        guesses = snapshot["guesses"]
+        feedbacks = snapshot["feedbacks"]
+        word_length = snapshot["len"]
+        max_attempts = snapshot["max"]
+        if not isinstance(word_length, int) or not isinstance(max_attempts, int):
+            raise ValueError("存档长度或次数错误")
+        if not isinstance(targets, list) or len(targets) not in BOARD_COUNTS or not all(map(is_word, targets)):
+            raise ValueError("存档目标词错误")
+        if not isinstance(guesses, list) or not isinstance(feedbacks, list) or len(guesses) != len(feedbacks):
+            raise ValueError("存档猜测记录错误")
+        if not len(guesses) < max_attempts <= 200 or not all(map(is_word, guesses)):
+            raise ValueError("存档猜测记录错误")
+
+        board_count = len(targets)
+        for feedback in feedbacks:
+            if board_count == 1:
+                valid = is_codes(feedback)
+            else:
+                valid = isinstance(feedback, list) and len(feedback) == board_count and all(
+                    codes == "" or is_codes(codes) for codes in feedback
+                )
+            if not valid:
+                raise ValueError("存档结果记录错误")
+
+        solved = snapshot.get("solved", [0] * board_count)
+        if not isinstance(solved, list) or len(solved) != board_count:
+            raise ValueError("存档棋盘状态错误")
+        if snapshot.get("diff", "随机") not in DIFFICULTY_LEVELS:
+            raise ValueError("存档难度错误")
+        keys = snapshot.get("keys", {} if board_count == 1 else [{}] * board_count)
+        if board_count == 1:
+            valid = is_keys(keys)
+        else:
+            valid = isinstance(keys, list) and len(keys) == board_count and all(map(is_keys, keys))
+        if not valid:
+            raise ValueError("存档键盘状态错误")
+        float(snapshot.get("elapsed", 0))
+
+    def restore_snapshot(self):
+        """从存档一次性重建棋盘, 不逐行重放猜测"""
+        try:
+            with open(SAVE_FILE, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except OSError:
+            return
+        except ValueError:
+            self.discard_snapshot()
+            return
+
+        # 结构不对的存档直接丢弃, 不影响程序启动
+        try:
+            self.check_snapshot(snapshot)
+        except (ValueError, KeyError, TypeError):
+            self.discard_snapshot()
+            return
+        targets = snapshot["targets"]
+        guesses = snapshot["guesses"]
+        feedbacks = snapshot["feedbacks"]
+        word_length = snapshot["len"]
+        max_attempts = snapshot["max"]
+
+        self.word_length = word_length
+        self.max_attempts = max_attempts
+        self.board_count = len(targets)
+        self.difficulty = snapshot.get("diff", "随机")
+        self.hard_mode = bool(snapshot.get("hard", 0))
+        self.set_targets(targets)
+        self.constraints = HardModeConstraints(word_length)
+        self.current_input = []
+        self.guesses = list(guesses)
+        self.feedbacks = list(feedbacks)
+        self.current_attempt = len(guesses)
+        self.solved_boards = [bool(solved) for solved in snapshot.get("solved", self.solved_boards)]
+        self.game_start_time = time.time() - float(snapshot.get("elapsed", 0))
+        self.reset_ui()
+
+        code_colors = {"2": self.CORRECT_COLOR, "1": self.PRESENT_COLOR, "0": self.ABSENT_COLOR}
+        if self.board_view:
+            for row, (guess, feedback) in enumerate(zip(guesses, feedbacks)):
+                for board, codes in enumerate(feedback):
+                    if codes:
+                        self.board_view.paint_row(board, row, guess, codes, animate=False)
+            for board, solved in enumerate(self.solved_boards):
+                if solved:
+                    self.board_view.mark_solved(board)
+            self.board_view.set_input(self.active_boards(), self.current_attempt, [])
+            self.board_key_colors = [dict(colors) for colors in snapshot.get("keys", self.board_key_colors)]
+            self.update_key_images(self.key_buttons)
+        else:
+            for row, (guess, codes) in enumerate(zip(guesses, feedbacks)):
+                self.constraints.update(guess, codes)
+                for label, char, code in zip(self.letter_grid[row], guess, codes):
+                    label.configure(text=char.upper(), bg=code_colors[code], fg="white")
+            for char, color in snapshot.get("keys", {}).items():
+                if char in self.key_buttons and color != self.KEY_DEFAULT:
+                    self.key_buttons[char].configure(bg=color, fg="white")
+                    self.key_colors[char] = color
+
+        self.resumed = True
+        self.status_var.set(f"已恢复上次的游戏 (第 {self.current_attempt + 1} 次尝试), 正在加载词库...")
+
+    def validate_snapshot(self):
+        """词库加载完成后检查恢复的游戏是否仍然有效"""
+        valid = all(word in self.dictionary and len(word) == self.word_length for word in self.target_words)
+        for guess, feedback in zip(self.guesses, self.feedbacks):
+            if not valid:
+                break
+            expected = score_guess_batch(guess, self.target_words, self.target_counts)
+            if self.board_count == 1:
+                valid = feedback == expected[0]
+            else:
+                valid = all(not codes or codes == exp for codes, exp in zip(feedback, expected))
+        return valid
+
+    def flush_history(self):
+        """定期把缓冲的游戏记录写入磁盘"""
+        self.history.flush()
+        self.root.after(30000, self.flush_history)
         
    
     def process_queue(self):
@@ -206,6 +1957,11 @@ class WordleGame:
         try:
             while True:
                 msg = self.message_queue.get_nowait()
+                if isinstance(msg, tuple):
+                    # 加载线程建好的词库状态, 在主线程一次性替换
+                    msg, loaded = msg
+                    for name, value in loaded.items():
+                        setattr(self, name, value)
                 if msg == "CLOSE_LOADING":
                     if hasattr(self, 'loading_window') and self.loading_window.winfo_exists():
                         self.loading_window.destroy()
@@ -218,9 +1974,18 @@ class WordleGame:
                     self.status_var.set(msg[7:])
                 elif msg == "DICT_LOADED":
                     self.dictionary_loaded = True
-                    self.status_var.set(f"词库加载完成: {len(self.dictionary)} 个单词")
-                    tk.messagebox.showinfo("加载完成",f"词库加载完成: {len(self.dictionary)} 个单词")
-                    self.root.after(100, self.start_new_game)
+                    # 解析吞吐量的状态消息会被这里覆盖, 一并显示在完成消息里
+                    summary = f" ({self.parse_summary})" if self.parse_summary else ""
+                    self.status_var.set(f"词库加载完成: {len(self.dictionary)} 个单词{summary}")
+                    tk.messagebox.showinfo("加载完成",f"词库加载完成: {len(self.dictionary)} 个单词{summary}")
+                    if self.resumed and self.validate_snapshot():
+                        self.status_var.set(f"已恢复上次的游戏: 第 {self.current_attempt + 1} 次尝试")
+                    else:
+                        self.resumed = False
+                        self.root.after(100, self.start_new_game)
+                elif msg == "DICT_REFRESHED":
+                    summary = f" ({self.parse_summary})" if self.parse_summary else ""
+                    self.status_var.set(f"词库已更新: {len(self.dictionary)} 个单词{summary}")
         except queue.Empty:
             pass
         self.root.after(100, self.process_queue)
@@ -237,11 +2002,18 @@ class WordleGame:
         game_menu.add_command(label="新游戏", command=self.show_game_settings)
         game_menu.add_command(label="导入游戏", command=self.import_game)
         game_menu.add_command(label="导出游戏", command=self.export_game)
+        game_menu.add_command(label="字母组词", command=self.show_letter_bank)
+        game_menu.add_command(label="粘贴单词", command=self.paste_clipboard, accelerator="Ctrl+V")
+        game_menu.add_separator()
+        game_menu.add_command(label="统计", command=self.show_statistics)
+        game_menu.add_command(label="从网络更新词库", command=self.refresh_dictionary)
 
         # 创建帮助菜单
         help_menu = tk.Menu(menu_bar, tearoff=0)
         menu_bar.add_cascade(label="帮助", menu=help_menu)
         help_menu.add_command(label="游戏规则", command=self.show_instructions)
+        help_menu.add_command(label="字母组词提示", command=self.show_anagram_hint)
+        help_menu.add_command(label="输入延迟", command=self.show_input_latency)
 
     def create_game_grid(self):
         # 创建游戏网格框架
@@ -331,6 +2103,7 @@ class WordleGame:
 
         self.key_buttons = {}
         self.key_colors = {}
+        self.key_images = {}
 
         for row_idx, row in enumerate(keyboard_rows):
             row_frame = tk.Frame(self.keyboard_frame, bg=self.DEFAULT_BG)
@@ -346,7 +2119,7 @@ class WordleGame:
                     fg=self.TEXT_COLOR,
                     relief="raised",
                     borderwidth=0,
-                    command=lambda c=char: self.add_letter(c)
+                    command=lambda c=char: self.inject_text(c)
                 )
                 btn.pack(side=tk.LEFT, padx=2)
                 self.key_buttons[char] = btn
@@ -365,7 +2138,7 @@ class WordleGame:
             fg=self.TEXT_COLOR,
             relief="raised",
             borderwidth=0,
-            command=self.remove_letter
+            command=lambda: self.inject_text("\b")
         )
         backspace_btn.pack(side=tk.LEFT, padx=2)
 
@@ -378,7 +2151,7 @@ class WordleGame:
             fg=self.TEXT_COLOR,
             relief="raised",
             borderwidth=0,
-            command=self.submit_guess
+            command=lambda: self.inject_text("\n")
         )
         enter_btn.pack(side=tk.RIGHT, padx=2)
 
@@ -403,9 +2176,15 @@ class WordleGame:
 
         messagebox.showinfo("游戏规则", instructions)
 
+    def dictionary_source(self):
+        """优先使用下载的 CSV 词库, 其次是随程序附带的压缩词库, 都没有时返回 None"""
+        if os.path.exists(self.LOCAL_DICT):
+            return self.LOCAL_DICT
+        return find_bundled_dictionary(self.LOCAL_DICT)
+
     def load_dictionary(self):
-        # 检查本地词库是否存在
-        if not os.path.exists(self.LOCAL_DICT):
+        # 本地和附带的词库都不存在时才需要联网下载
+        if self.dictionary_source() is None:
             # 显示加载窗口
             self.show_loading_window()
             # 在新线程中下载词库
@@ -468,7 +2247,14 @@ class WordleGame:
             self.loading_window.destroy()
         self.root.destroy()
 
-    def download_dictionary_thread(self):
+    def refresh_dictionary(self):
+        """从网络重新下载词库, 下载完成后替换当前词库, 不打断正在进行的游戏"""
+        if not self.dictionary_loaded:
+            self.status_var.set("词库尚未加载完成，请稍候...")
+            return
+        threading.Thread(target=self.download_dictionary_thread, args=(True,), daemon=True).start()
+
+    def download_dictionary_thread(self, refresh=False):
         try:
             # 发送状态消息到主线程
             self.message_queue.put("STATUS:正在下载词库...")
@@ -477,43 +2263,129 @@ class WordleGame:
             with urllib.request.urlopen(self.DICT_URL) as response:
                 data = response.read().decode("utf-8")
 
-            # 保存到文件
-            with open(self.LOCAL_DICT, "w", encoding="utf-8") as file:
+            # 先写临时文件再替换, 下载失败不会留下不完整的词库
+            tmp_path = self.LOCAL_DICT + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
                 file.write(data)
+            os.replace(tmp_path, self.LOCAL_DICT)
 
-            # 发送消息关闭加载窗口
-            self.message_queue.put("CLOSE_LOADING")
+            if not refresh:
+                # 发送消息关闭加载窗口
+                self.message_queue.put("CLOSE_LOADING")
 
             # 加载词库
-            self.load_dictionary_from_file_thread()
+            self.load_dictionary_from_file_thread(refresh)
 
         except Exception as e:
-            self.message_queue.put(f"ERROR:下载词库失败: {str(e)}")
+            if refresh:
+                self.message_queue.put(f"STATUS:更新词库失败: {str(e)}")
+            else:
+                self.message_queue.put(
+                    f"ERROR:下载词库失败: {str(e)}\n\n"
+                    f"也可以手动下载 {self.DICT_URL}, 把 EnWords.csv 放在当前目录, "
+                    f"或把压缩词库 EnWords.csv.xz 放在 {BUNDLED_DICT_DIR} 后重新启动"
+                )
 
-    def load_dictionary_from_file_thread(self):
+    def load_dictionary_from_file_thread(self, refresh=False):
         try:
             # 发送状态消息到主线程
             self.message_queue.put("STATUS:正在加载词库...")
 
-            with open(self.LOCAL_DICT, "r", encoding="utf-8") as file:
-                reader = csv.reader(file)
-                for row in reader:
-                    if len(row) < 2:
-                        continue
-
-                    word = row[0].strip().lower()
-                    meaning = row[1].strip()
-
-                    # 只保留3-12字母的单词
-                    if 3 <= len(word) <= 12 and re.match(r"^[a-z]+$", word):
-                        self.dictionary.append(word)
-                        self.word_meanings[word] = meaning
+            # 优先使用编译好的缓存, 源文件变化后重新生成
+            source = self.dictionary_source()
+            store = WordStore.load(self.DICT_CACHE, source)
+            parse_summary = ""
+            if store is None:
+                parse_stats = {}
+                words, meanings, frequencies = read_dictionary_file(source, stats=parse_stats)
+                parse_summary = (f"解析 {parse_stats['bytes'] / 1024 / 1024:.1f} MB, "
+                                 f"{parse_stats['chunks']} 块, {parse_stats['mb_per_s']:.1f} MB/s")
+                self.message_queue.put(f"STATUS:词库解析完成: {parse_summary}")
+                store = WordStore.build(words, meanings, frequencies)
+                try:
+                    store.save(self.DICT_CACHE, source)
+                    store = WordStore.load(self.DICT_CACHE, source) or store
+                except OSError as e:
+                    print(f"保存词库缓存失败: {e}")
+
+            # 先在本线程建好全部索引, 再交给主线程一次性替换,
+            # 更新词库时主线程不会看到新旧混杂的状态
+            ratings = DifficultyRatings.load(self.DICT_RATINGS, store)
+            suggestions = SuggestionIndex.load(self.DICT_SUGGEST, store)
+            loaded = {
+                "dictionary": store,
+                "word_meanings": MeaningTable(store),
+                "ratings": ratings,
+                "suggestions": suggestions,
+                "words_by_length": store.buckets,
+                "parse_summary": parse_summary,
+                "alias_tables": self.build_alias_tables(store, ratings),
+                "anagram_index": AnagramIndex(store)
+            }
 
             # 标记词库已加载
-            self.message_queue.put("DICT_LOADED")
+            self.message_queue.put(("DICT_REFRESHED" if refresh else "DICT_LOADED", loaded))
+
+            # 缺少的拼写提示索引不影响开始游戏, 在后台补建
+            threading.Thread(target=self.build_suggestion_index, args=(store, suggestions),
+                             daemon=True).start()
 
         except Exception as e:
-            self.message_queue.put(f"ERROR:加载词库失败: {str(e)}")
+            if refresh:
+                self.message_queue.put(f"STATUS:更新词库失败: {str(e)}")
+            else:
+                self.message_queue.put(f"ERROR:加载词库失败: {str(e)}")
+
+    def build_suggestion_index(self, store, suggestions):
+        """为缺少拼写提示索引的长度建索引, 当前长度优先, 完成后写入缓存"""
+        missing = [length for length in sorted(store.buckets) if length not in suggestions]
+        if not missing:
+            return
+        missing.sort(key=lambda length: length != self.word_length)
+        for length in missing:
+            suggestions.orders[length] = SuggestionIndex.build_orders(store.buckets[length])
+        try:
+            suggestions.save(self.DICT_SUGGEST, store)
+        except OSError as e:
+            print(f"保存拼写提示索引失败: {e}")
+
+    def build_alias_tables(self, store, ratings):
+        """为每个长度的"简单"和"困难"预先计算别名表, 返回 {(长度, 难度): AliasTable}
+
+        "随机"是均匀分布, 不需要别名表, 由 pick_word_index 直接 randrange.
+        """
+        alias_tables = {}
+        for length, words in store.buckets.items():
+            if np is not None:
+                eases = bucket_eases(store, ratings, length)
+                alias_tables[(length, "简单")] = AliasTable(eases)
+                alias_tables[(length, "困难")] = AliasTable(1.0 / eases)
+                continue
+
+            # 统计该长度下各字母出现的比例, 用于估算常见度
+            letter_count = {}
+            for word in words:
+                for c in set(word):
+                    letter_count[c] = letter_count.get(c, 0) + 1
+            letter_freq = {c: n / len(words) for c, n in letter_count.items()}
+
+            rated = length in ratings
+            eases = []
+            for i, word in enumerate(words):
+                meaning = store.meaning_at(length, i)
+                frequency = store.frequency_at(length, i)
+                rating = ratings.rating_at(length, i) if rated else None
+                eases.append(word_weight(word, meaning, frequency, letter_freq, "简单", rating))
+            alias_tables[(length, "简单")] = AliasTable(eases)
+            alias_tables[(length, "困难")] = AliasTable([1.0 / ease for ease in eases])
+        return alias_tables
+
+    def pick_word_index(self, length, difficulty):
+        """按难度从指定长度的单词中抽取一个下标"""
+        table = self.alias_tables.get((length, difficulty))
+        if table is None:
+            return random.randrange(len(self.words_by_length[length]))
+        return table.sample()
 
     def start_new_game(self):
         # 确保词库已加载
@@ -521,57 +2393,266 @@ class WordleGame:
             self.status_var.set("词库尚未加载完成，请稍候...")
             return
 
-        # 过滤指定长度的单词
-        filtered = [word for word in self.dictionary if len(word) == self.word_length]
+        # 取出指定长度的单词
+        filtered = self.words_by_length.get(self.word_length)
 
         if not filtered:
             messagebox.showerror("错误", f"没有找到长度为 {self.word_length} 的单词")
             return
 
-        # 随机选择目标单词
-        self.target_word = random.choice(filtered)
+        # 按难度权重选择目标单词, 多棋盘模式下尽量不重复
+        targets = []
+        tries = 0
+        while len(targets) < self.board_count:
+            word = filtered[self.pick_word_index(self.word_length, self.difficulty)]
+            tries += 1
+            if word not in targets or tries > self.board_count * 20:
+                targets.append(word)
+        self.set_targets(targets)
         self.current_attempt = 0
+        self.reset_round_state()
         self.reset_ui()
-        self.status_var.set(f"新游戏开始! 单词长度: {self.word_length}, 尝试次数: {self.max_attempts}")
+        boards = f", 棋盘: {self.board_count}" if self.board_count > 1 else ""
+        hard = ", 困难模式" if self.hard_mode and self.board_count == 1 else ""
+        self.status_var.set(
+            f"新游戏开始! 单词长度: {self.word_length}, 尝试次数: {self.max_attempts}, "
+            f"难度: {self.difficulty}{boards}{hard}"
+        )
+
+    def set_targets(self, targets):
+        # 设置各棋盘的目标词并预先统计字母
+        self.target_words = list(targets)
+        self.target_word = self.target_words[0]
+        self.target_counts = [letter_counts(word) for word in self.target_words]
+        self.solved_boards = [False] * len(self.target_words)
+
+    def reset_round_state(self):
+        # 重置本局的猜测记录
+        self.guesses = []
+        self.feedbacks = []
+        self.current_input = []
+        self.game_start_time = time.time()
+        self.game_recorded = False
+        self.resumed = False
+        self.constraints = HardModeConstraints(self.word_length)
+        self.discard_snapshot()
+
+    def record_game(self, won):
+        """游戏结束时追加一条记录"""
+        if self.game_recorded:
+            return
+        self.game_recorded = True
+        self.discard_snapshot()
+        settings = {"len": self.word_length, "max": self.max_attempts, "diff": self.difficulty}
+        if self.board_count > 1:
+            settings["boards"] = self.board_count
+        if self.hard_mode and self.board_count == 1:  # 多棋盘不检查困难模式
+            settings["hard"] = 1
+        self.history.append({
+            "t": self.target_word if self.board_count == 1 else self.target_words,
+            "g": self.guesses,
+            "f": self.feedbacks,
+            "w": int(won),
+            "d": round(time.time() - self.game_start_time, 1),
+            "s": settings,
+            "ts": int(time.time())
+        })
 
     def reset_ui(self):
+        # 停止旧网格上的动画
+        self.animator.clear()
+
         # 重置游戏网格
-        self.create_letter_grid()
+        self.shown_input = ""
+        if self.board_count > 1:
+            self.create_board_view()
+        else:
+            self.board_view = None
+            self.create_letter_grid()
 
         # 重置键盘颜色
+        self.key_images = {}
         for char, btn in self.key_buttons.items():
-            btn.configure(bg=self.KEY_DEFAULT)
+            btn.configure(bg=self.KEY_DEFAULT, image="", width=4, height=0)
             self.key_colors[char] = self.KEY_DEFAULT
 
+        self.board_key_colors = [dict() for _ in range(self.board_count)]
+        if self.board_count > 1:
+            self.update_key_images(self.key_buttons)
+
         # 重置滚动区域
         self.canvas.yview_moveto(0.0)
 
-    def add_letter(self, char):
-        if not self.dictionary_loaded:
-            self.status_var.set("词库尚未加载完成，请稍候...")
-            return
+    def create_board_view(self):
+        # 清除现有网格, 改用画布绘制多个棋盘
+        for widget in self.scrollable_frame.winfo_children():
+            widget.destroy()
 
-        if self.current_attempt >= self.max_attempts:
+        self.letter_grid = []
+        self.board_view = MultiBoardView(
+            self.scrollable_frame,
+            self.board_count,
+            self.word_length,
+            {
+                "bg": self.DEFAULT_BG,
+                "border": self.DEFAULT_BORDER,
+                "text": self.TEXT_COLOR,
+                "correct": self.CORRECT_COLOR,
+                "present": self.PRESENT_COLOR,
+                "absent": self.ABSENT_COLOR
+            },
+            self.animator
+        )
+        self.board_view.set_input(self.active_boards(), 0, [])
+
+    def active_boards(self):
+        return [board for board, solved in enumerate(self.solved_boards) if not solved]
+
+    def update_key_images(self, chars):
+        """多棋盘模式下按键分成若干块, 每块显示一个棋盘中该字母的状态"""
+        width, height = 40, 32
+        columns = min(self.board_count, 4)
+        rows = (self.board_count + columns - 1) // columns
+        seg_w, seg_h = width // columns, height // rows
+
+        for char in chars:
+            btn = self.key_buttons.get(char)
+            if not btn:
+                continue
+            image = self.key_images.get(char)
+            if image is None:
+                image = tk.PhotoImage(width=width, height=height)
+                self.key_images[char] = image
+                btn.configure(image=image, compound="center", width=width, height=height)
+
+            for board in range(self.board_count):
+                if self.solved_boards[board]:
+                    color = self.DEFAULT_BORDER
+                else:
+                    color = self.board_key_colors[board].get(char, self.KEY_DEFAULT)
+                x = (board % columns) * seg_w
+                y = (board // columns) * seg_h
+                image.put(color, to=(x, y, x + seg_w, y + seg_h))
+
+    def inject_text(self, text, stamp=None):
+        """把按键、屏幕键盘或粘贴的文本放入输入缓冲, 也可用于自动化测试
+
+        字母为输入, "\b" 为退格, "\n" 为提交, 其他字符忽略.
+        stamp 为按下时间(perf_counter), 不传时取当前时间.
+        距上次处理不足一帧时等到下一帧, 否则在本轮事件处理完后立即处理.
+        """
+        now = time.perf_counter()
+        if stamp is None:
+            stamp = now
+        for char in text.lower().replace("\r", "\n"):
+            if "a" <= char <= "z" or char in "\b\n":
+                self.pending_input.append((char, stamp))
+
+        if self.pending_input and self.input_after_id is None:
+            wait = self.last_input_flush + self.animator.interval - now
+            if wait > 0:
+                self.input_after_id = self.root.after(max(1, int(wait * 1000)), self.flush_input)
+            else:
+                self.input_after_id = self.root.after_idle(self.flush_input)
+
+    def flush_input(self):
+        """处理缓冲中的全部按键, 当前行只重绘一次"""
+        self.input_after_id = None
+        self.last_input_flush = time.perf_counter()
+        stamps = []
+        dirty = False
+        while self.pending_input:
+            char, stamp = self.pending_input.popleft()
+            stamps.append(stamp)
+
+            # 游戏结束后只响应回车开始新游戏
+            if self.end:
+                if char == "\n":
+                    self.end = False
+                    self.start_new_game()
+                continue
+
+            if char == "\n":
+                if dirty:
+                    self.render_input()
+                    dirty = False
+                self.submit_guess()
+            elif not self.dictionary_loaded:
+                if char != "\b":
+                    self.status_var.set("词库尚未加载完成，请稍候...")
+            elif self.current_attempt >= self.max_attempts:
+                continue
+            elif char == "\b":
+                if self.current_input:
+                    self.current_input.pop()
+                    dirty = True
+            elif len(self.current_input) < self.word_length:
+                self.current_input.append(char.upper())
+                dirty = True
+
+        if dirty:
+            self.render_input()
+
+        # 空闲回调排在本次改动触发的重绘之后, 执行时即为绘制完成
+        if stamps:
+            self.root.after_idle(self.record_input_latency, stamps)
+
+    def render_input(self):
+        """把输入缓冲画到当前行, 只改动变化的格子"""
+        if self.board_view:
+            self.board_view.set_input(self.active_boards(), self.current_attempt, self.current_input)
             return
 
-        # 找到当前行第一个空位置
+        text = "".join(self.current_input)
+        row = self.letter_grid[self.current_attempt]
         for col in range(self.word_length):
-            if not self.letter_grid[self.current_attempt][col].cget("text"):
-                self.letter_grid[self.current_attempt][col].configure(text=char.upper())
-                return
+            new = text[col] if col < len(text) else ""
+            old = self.shown_input[col] if col < len(self.shown_input) else ""
+            if new != old:
+                row[col].configure(text=new)
+        self.shown_input = text
 
-    def remove_letter(self):
-        if not self.dictionary_loaded:
-            return
+    def record_input_latency(self, stamps):
+        now = time.perf_counter()
+        self.input_latency.extend(now - stamp for stamp in stamps)
 
-        if self.current_attempt >= self.max_attempts:
+    def input_latency_stats(self):
+        """返回按键到绘制完成的延迟 p50/p99(毫秒)
+
+        实体按键从事件时间戳算起, 屏幕键盘、粘贴和自动输入从处理函数开始算起.
+        """
+        times = sorted(self.input_latency)
+        if not times:
+            return {"keys": 0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+        return {
+            "keys": len(times),
+            "p50": times[len(times) // 2] * 1000,
+            "p99": times[min(len(times) - 1, int(len(times) * 0.99))] * 1000,
+            "max": times[-1] * 1000
+        }
+
+    def show_input_latency(self):
+        stats = self.input_latency_stats()
+        if not stats["keys"]:
+            messagebox.showinfo("输入延迟", "还没有按键记录")
             return
+        frames = self.animator.stats()
+        messagebox.showinfo(
+            "输入延迟",
+            f"最近 {stats['keys']} 次按键从按下到绘制完成:\n"
+            f"p50 {stats['p50']:.1f} ms, p99 {stats['p99']:.1f} ms, 最大 {stats['max']:.1f} ms\n\n"
+            f"动画帧耗时: p50 {frames['p50']:.1f} ms, p99 {frames['p99']:.1f} ms, 丢帧 {frames['dropped']}"
+        )
 
-        # 从当前行最后一个字母开始删除
-        for col in range(self.word_length - 1, -1, -1):
-            if self.letter_grid[self.current_attempt][col].cget("text"):
-                self.letter_grid[self.current_attempt][col].configure(text="")
-                return
+    def paste_clipboard(self, event=None):
+        """粘贴单词: 取剪贴板中的字母替换当前行的输入"""
+        try:
+            text = self.root.clipboard_get()
+        except tk.TclError:
+            return
+        letters = "".join(c for c in text.lower() if "a" <= c <= "z")
+        if letters:
+            self.inject_text("\b" * self.word_length + letters[:self.word_length])
 
     def submit_guess(self):
         if not self.dictionary_loaded:
@@ -581,25 +2662,42 @@ class WordleGame:
         if self.current_attempt >= self.max_attempts:
             return
 
-        # 收集当前行的字母
-        guess_chars = []
-        for col in range(self.word_length):
-            letter = self.letter_grid[self.current_attempt][col].cget("text")
-            if not letter:
-                self.status_var.set("请完成单词输入！")
-                return
-            guess_chars.append(letter.lower())
+        # 当前行的字母
+        if len(self.current_input) < self.word_length:
+            self.status_var.set("请完成单词输入！")
+            if not self.board_view:
+                self.shake_current_row()
+            return
 
-        guess = "".join(guess_chars)
+        guess = "".join(self.current_input).lower()
 
         # 检查单词是否在词库中
         if guess not in self.dictionary:
-            self.status_var.set("单词不在词库中！")
+            suggestions = self.suggestions.suggest(self.dictionary, guess)
+            if suggestions:
+                self.status_var.set(f"单词不在词库中！你是不是想输入: {', '.join(word.upper() for word in suggestions)}")
+            else:
+                self.status_var.set("单词不在词库中！")
+            self.shake_current_row()
             return
 
+        # 困难模式下必须沿用已揭示的提示(只用于单棋盘)
+        if self.hard_mode and not self.board_view:
+            error = self.constraints.check(guess)
+            if error:
+                self.status_var.set(f"困难模式: {error}")
+                self.shake_current_row()
+                return
+
         # 处理猜测
-        self.process_guess(guess)
+        if self.board_view:
+            self.process_multi_guess(guess)
+        else:
+            self.process_guess(guess)
         self.current_attempt += 1
+        self.current_input = []
+        self.shown_input = ""
+        self.schedule_snapshot()
 
         # 更新状态栏
         meaning = self.word_meanings.get(guess, "")
@@ -609,10 +2707,12 @@ class WordleGame:
             self.status_var.set(f"已提交: {guess.upper()}")
 
         # 检查游戏结果
-        if guess == self.target_word:
+        if self.solved_boards and all(self.solved_boards):
             self.game_won()
         elif self.current_attempt == self.max_attempts:
             self.game_lost()
+        elif self.board_view:
+            self.board_view.set_input(self.active_boards(), self.current_attempt, [])
 
         # 如果尝试次数多，滚动到最新一行
         if self.max_attempts > 10:
@@ -625,68 +2725,83 @@ class WordleGame:
         self.canvas.yview_moveto(scroll_position)
 
     def process_guess(self, guess):
-        # 复制目标词字母计数
-        target_count = {}
-        for char in self.target_word:
-            target_count[char] = target_count.get(char, 0) + 1
-
-        # 先标记正确位置（绿色）
-        for i in range(len(guess)):
-            guess_char = guess[i]
-            if guess_char == self.target_word[i]:
-                self.letter_grid[self.current_attempt][i].configure(
-                    bg=self.CORRECT_COLOR,
-                    fg="white"
-                )
-                target_count[guess_char] -= 1
-
-        # 再标记其他情况
-        for i in range(len(guess)):
-            guess_char = guess[i]
-            label = self.letter_grid[self.current_attempt][i]
-
-            # 如果已经是绿色，跳过
-            if label.cget("bg") == self.CORRECT_COLOR:
-                continue
+        # 计算每个位置的结果
+        codes = score_guess(guess, self.target_word)
+        self.guesses.append(guess)
+        self.feedbacks.append(codes)
+        self.constraints.update(guess, codes)
+        if guess == self.target_word:
+            self.solved_boards[0] = True
 
-            # 如果字母在目标词中且还有剩余，标记为黄色
-            if guess_char in self.target_word and target_count.get(guess_char, 0) > 0:
-                label.configure(
-                    bg=self.PRESENT_COLOR,
-                    fg="white"
-                )
-                target_count[guess_char] -= 1
-            else:
-                label.configure(
-                    bg=self.ABSENT_COLOR,
-                    fg="white"
-                )
+        # 翻牌显示每个格子的颜色
+        code_colors = {"2": self.CORRECT_COLOR, "1": self.PRESENT_COLOR, "0": self.ABSENT_COLOR}
+        row = self.letter_grid[self.current_attempt]
+        for label in row:
+            label.configure(fg="white")
+        self.animator.add(Animation(reveal_tracks(
+            row, [code_colors[code] for code in codes], flip_color=self.DEFAULT_BORDER
+        )))
 
         # 更新键盘颜色
-        for char in guess:
+        for char in set(guess):
             # 获取当前字母在键盘上的按钮
             btn = self.key_buttons.get(char)
             if not btn:
                 continue
 
-            # 获取当前字母在网格中的颜色
-            char_color = None
-            for i in range(len(guess)):
-                if guess[i] == char:
-                    label_color = self.letter_grid[self.current_attempt][i].cget("bg")
-                    if label_color == self.CORRECT_COLOR:
-                        char_color = self.CORRECT_COLOR
-                    elif label_color == self.PRESENT_COLOR and char_color != self.CORRECT_COLOR:
-                        char_color = self.PRESENT_COLOR
-                    elif label_color == self.ABSENT_COLOR and char_color != self.CORRECT_COLOR and char_color != self.PRESENT_COLOR:
-                        char_color = "#cd382c"
+            # 取该字母在本次猜测中的最好结果
+            best = max(code for c, code in zip(guess, codes) if c == char)
+            if best == "2":
+                char_color = self.CORRECT_COLOR
+            elif best == "1":
+                char_color = self.PRESENT_COLOR
+            else:
+                char_color = "#cd382c"
 
             # 更新键盘按钮颜色
-            if char_color and char_color != self.key_colors[char]:
+            if char_color != self.key_colors[char]:
                 btn.configure(bg=char_color, fg="white")
                 self.key_colors[char] = char_color
 
+    def process_multi_guess(self, guess):
+        """对所有仍在进行的棋盘批量计分, 只重绘这些棋盘"""
+        active = self.active_boards()
+        results = score_guess_batch(
+            guess,
+            [self.target_words[board] for board in active],
+            [self.target_counts[board] for board in active]
+        )
+
+        feedback = [""] * self.board_count
+        changed_keys = set(guess)
+        rank = {self.KEY_DEFAULT: 0, "#cd382c": 1, self.PRESENT_COLOR: 2, self.CORRECT_COLOR: 3}
+        for board, codes in zip(active, results):
+            feedback[board] = codes
+            self.board_view.paint_row(board, self.current_attempt, guess, codes)
+
+            # 更新该棋盘的键盘状态, 只升级不降级
+            key_colors = self.board_key_colors[board]
+            for char, code in zip(guess, codes):
+                color = self.CORRECT_COLOR if code == "2" else self.PRESENT_COLOR if code == "1" else "#cd382c"
+                if rank[color] > rank[key_colors.get(char, self.KEY_DEFAULT)]:
+                    key_colors[char] = color
+
+            if codes == "2" * self.word_length:
+                self.solved_boards[board] = True
+                self.board_view.mark_solved(board)
+                changed_keys = self.key_buttons
+
+        self.guesses.append(guess)
+        self.feedbacks.append(feedback)
+        self.update_key_images(changed_keys)
+
     def game_won(self):
+        if self.board_count > 1:
+            self.status_var.set(f"恭喜你全部猜对了！单词: {', '.join(w.upper() for w in self.target_words)}")
+            self.end = True
+            self.record_game(True)
+            return
+
         meaning = self.word_meanings.get(self.target_word, "")
         if meaning:
             self.status_var.set(f"恭喜你猜对了！单词: {self.target_word.upper()}\n{meaning}")
@@ -694,53 +2809,209 @@ class WordleGame:
             self.status_var.set(f"恭喜你猜对了！单词: {self.target_word.upper()}")
 
         self.end = True
+        self.record_game(True)
 
         # 显示胜利动画
         self.show_victory_animation()
 
+    def reveal_duration(self):
+        # 最后一行翻牌动画结束的时间
+        return (self.word_length - 1) * 0.08 + 0.12
+
     def show_victory_animation(self):
-        # 在胜利时添加一些视觉效果
-        for row in range(self.max_attempts):
-            for col in range(self.word_length):
-                if row < self.current_attempt:
-                    self.animate_label(self.letter_grid[row][col])
-
-    def animate_label(self, label):
-        # 简单的动画效果
-        original_bg = label.cget("bg")
-
-        def flash():
-            current_bg = label.cget("bg")
-            if current_bg == original_bg:
-                label.configure(bg="#FFFFFF")
-                label.after(100, flash)
-            else:
-                label.configure(bg=original_bg)
+        # 在胜利时添加一些视觉效果, 等最后一行翻牌结束后开始
+        code_colors = {"2": self.CORRECT_COLOR, "1": self.PRESENT_COLOR, "0": self.ABSENT_COLOR}
+        grid_colors = [
+            [(label, code_colors[code]) for label, code in zip(self.letter_grid[row], self.feedbacks[row])]
+            for row in range(self.current_attempt)
+        ]
+        self.animator.add(Animation(win_tracks(grid_colors, delay=self.reveal_duration())))
 
-        flash()
+    def shake_current_row(self):
+        # 输入无效时抖动当前行
+        if self.board_view or self.current_attempt >= self.max_attempts:
+            return
+        self.animator.add(Animation(shake_tracks(
+            self.letter_grid[self.current_attempt], "highlightbackground", "#cd382c", self.DEFAULT_BORDER
+        )))
 
     def game_lost(self):
+        if self.board_count > 1:
+            missed = [self.target_words[board] for board in self.active_boards()]
+            self.status_var.set(f"游戏结束！未猜出: {', '.join(w.upper() for w in missed)}")
+            self.end = True
+            self.record_game(False)
+            for board in self.active_boards():
+                self.board_view.reveal_answer(board, self.current_attempt, self.target_words[board])
+            return
+
         meaning = self.word_meanings.get(self.target_word, "")
         if meaning:
             self.status_var.set(f"游戏结束！正确答案: {self.target_word.upper()}\n{meaning}")
         else:
             self.status_var.set(f"游戏结束！正确答案: {self.target_word.upper()}")
 
-
         self.end = True
+        self.record_game(False)
 
         # 高亮显示正确答案
         self.highlight_solution()
 
     def highlight_solution(self):
-        # 高亮显示正确答案
-        for row in range(self.max_attempts):
-            for col in range(self.word_length):
-                if row == self.current_attempt - 1:
-                    self.letter_grid[row][col].configure(
-                        bg="#FF6B6B",  # 浅红色
-                        fg="white"
-                    )
+        # 高亮显示正确答案, 在最后一行翻牌结束后生效
+        delay = self.reveal_duration()
+        self.animator.add(Animation([
+            (label, [(delay, {"bg": "#FF6B6B", "fg": "white"})])  # 浅红色
+            for label in self.letter_grid[self.current_attempt - 1]
+        ]))
+
+    def show_anagram_hint(self):
+        if not self.dictionary_loaded:
+            messagebox.showinfo("提示", "词库尚未加载完成，请稍候再试")
+            return
+
+        letters = simpledialog.askstring(
+            "字母组词提示", "请输入字母:", initialvalue="".join(self.current_input).lower()
+        )
+        if not letters:
+            return
+        letters = "".join(c for c in letters.lower() if "a" <= c <= "z")
+        if not letters:
+            messagebox.showerror("错误", "请输入字母")
+            return
+
+        anagrams = self.anagram_index.anagrams(letters)
+        words = self.anagram_index.buildable(letters)
+
+        hint_window = tk.Toplevel(self.root)
+        hint_window.title("字母组词提示")
+        hint_window.geometry("400x450")
+        hint_window.transient(self.root)
+
+        text_area = tk.Text(hint_window, wrap=tk.WORD, font=("Microsoft YaHei", 10), padx=10, pady=10)
+        text_area.pack(fill=tk.BOTH, expand=True)
+        text_area.insert(tk.END, f"字母: {letters.upper()}\n\n")
+        text_area.insert(tk.END, f"变位词: {', '.join(anagrams) if anagrams else '无'}\n\n")
+        text_area.insert(tk.END, f"可以拼出 {len(words)} 个单词:\n")
+        for length, group in itertools.groupby(words[:500], key=len):
+            text_area.insert(tk.END, f"{length} 个字母: {', '.join(group)}\n")
+        if len(words) > 500:
+            text_area.insert(tk.END, "...")
+        text_area.config(state=tk.DISABLED)
+
+    def show_letter_bank(self):
+        if not self.dictionary_loaded:
+            messagebox.showinfo("提示", "词库尚未加载完成，请稍候再试")
+            return
+
+        # 选一个最长不超过 9 个字母的单词, 打乱字母作为字母库
+        lengths = [length for length in self.words_by_length if length <= 9]
+        if not lengths:
+            messagebox.showerror("错误", "词库中没有合适的单词")
+            return
+        source = random.choice(self.words_by_length[max(lengths)])
+        letters = list(source)
+        random.shuffle(letters)
+        solutions = set(self.anagram_index.buildable(source))
+        found = []
+
+        bank_window = tk.Toplevel(self.root)
+        bank_window.title("字母组词")
+        bank_window.geometry("360x480")
+        bank_window.transient(self.root)
+        bank_window.configure(bg=self.DEFAULT_BG)
+
+        tk.Label(
+            bank_window,
+            text=" ".join(letters).upper(),
+            font=("Microsoft YaHei", 22, "bold"),
+            bg=self.DEFAULT_BG,
+            fg=self.TEXT_COLOR,
+            pady=10
+        ).pack()
+
+        progress_var = tk.StringVar()
+        progress_var.set(f"已找到 0 / {len(solutions)} 个单词")
+        tk.Label(bank_window, textvariable=progress_var, font=("Microsoft YaHei", 10),
+                 bg=self.DEFAULT_BG, fg=self.TEXT_COLOR).pack()
+
+        entry = tk.Entry(bank_window, width=20, font=("Microsoft YaHei", 12))
+        entry.pack(pady=5)
+        entry.focus_set()
+
+        found_list = tk.Listbox(bank_window, font=("Microsoft YaHei", 10), height=12)
+        found_list.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        def submit(event=None):
+            word = entry.get().strip().lower()
+            entry.delete(0, tk.END)
+            if word in found:
+                progress_var.set(f"{word.upper()} 已经找到过了")
+            elif word in solutions:
+                found.append(word)
+                found_list.insert(tk.END, f"{word}  {self.word_meanings.get(word, '')}")
+                progress_var.set(f"已找到 {len(found)} / {len(solutions)} 个单词")
+            else:
+                progress_var.set(f"{word.upper()} 不能由这些字母组成或不在词库中")
+            return "break"
+
+        def give_up():
+            found_list.delete(0, tk.END)
+            for word in sorted(solutions, key=lambda w: (-len(w), w)):
+                found_list.insert(tk.END, f"{word}{'  ✓' if word in found else ''}")
+            progress_var.set(f"已找到 {len(found)} / {len(solutions)} 个单词, 原词: {source.upper()}")
+
+        entry.bind("<Return>", submit)
+
+        button_frame = tk.Frame(bank_window, bg=self.DEFAULT_BG)
+        button_frame.pack(pady=5)
+        tk.Button(button_frame, text="提交", command=submit, font=("Microsoft YaHei", 10),
+                  width=8).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="查看答案", command=give_up, font=("Microsoft YaHei", 10),
+                  width=8).pack(side=tk.LEFT, padx=5)
+
+    def show_statistics(self):
+        # 刷新缓冲区, 保证统计与磁盘记录一致
+        self.history.flush()
+
+        stats_window = tk.Toplevel(self.root)
+        stats_window.title("统计")
+        stats_window.geometry("400x450")
+        stats_window.transient(self.root)
+
+        text_area = tk.Text(stats_window, wrap=tk.WORD, font=("Microsoft YaHei", 10), padx=10, pady=10)
+        text_area.pack(fill=tk.BOTH, expand=True)
+
+        keys = ["all"] + sorted(
+            (k for k in self.history.stats if k != "all"),
+            key=lambda k: tuple(int(part) for part in k.split("x"))
+        )
+        for key in keys:
+            entry = self.history.get(key)
+            played = entry["played"]
+            rate = entry["won"] * 100 / played if played else 0
+            if key == "all":
+                title = "全部"
+            elif "x" in key:
+                title = "长度 {} ({} 个棋盘)".format(*key.split("x"))
+            else:
+                title = f"长度 {key}"
+            text_area.insert(tk.END, f"{title}\n")
+            text_area.insert(tk.END, f"  已玩: {played}  胜率: {rate:.0f}%  "
+                                     f"当前连胜: {entry['streak']}  最长连胜: {entry['max_streak']}\n")
+
+            # 猜测次数分布
+            dist = entry["dist"]
+            if dist:
+                peak = max(dist.values())
+                for attempts in sorted(dist, key=int):
+                    bar = "█" * max(1, dist[attempts] * 20 // peak)
+                    text_area.insert(tk.END, f"  {attempts:>3} {bar} {dist[attempts]}\n")
+            text_area.insert(tk.END, "\n")
+
+        if not self.history.stats:
+            text_area.insert(tk.END, "还没有完成的游戏")
+        text_area.config(state=tk.DISABLED)
 
     def show_game_settings(self):
         if not self.dictionary_loaded:
@@ -750,7 +3021,7 @@ class WordleGame:
         # 创建设置对话框
         settings_dialog = tk.Toplevel(self.root)
         settings_dialog.title("新游戏设置")
-        settings_dialog.geometry("300x150")
+        settings_dialog.geometry("300x265")
         settings_dialog.transient(self.root)
         settings_dialog.grab_set()
         settings_dialog.resizable(False, False)
@@ -771,6 +3042,27 @@ class WordleGame:
         attempts_spin.delete(0, tk.END)
         attempts_spin.insert(0, str(self.max_attempts))
 
+        # 难度设置
+        tk.Label(settings_dialog, text="难度:", font=("Microsoft YaHei", 10)).grid(row=2, column=0, padx=5,
+                                                                                 pady=5, sticky="e")
+        difficulty_box = ttk.Combobox(settings_dialog, values=DIFFICULTY_LEVELS, state="readonly", width=6,
+                                      font=("Microsoft YaHei", 10))
+        difficulty_box.grid(row=2, column=1, padx=5, pady=5, sticky="w")
+        difficulty_box.set(self.difficulty)
+
+        # 棋盘数量设置
+        tk.Label(settings_dialog, text="棋盘数量:", font=("Microsoft YaHei", 10)).grid(row=3, column=0, padx=5,
+                                                                                     pady=5, sticky="e")
+        boards_box = ttk.Combobox(settings_dialog, values=BOARD_COUNTS, state="readonly", width=6,
+                                  font=("Microsoft YaHei", 10))
+        boards_box.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+        boards_box.set(str(self.board_count))
+
+        # 困难模式设置
+        hard_var = tk.BooleanVar(value=self.hard_mode)
+        tk.Checkbutton(settings_dialog, text="困难模式 (仅单棋盘)", variable=hard_var,
+                       font=("Microsoft YaHei", 10)).grid(row=4, column=0, columnspan=2, padx=5, pady=5)
+
         # 按钮
         def apply_settings():
             try:
@@ -780,6 +3072,9 @@ class WordleGame:
                 if 3 <= new_length <= 12 and 1 <= new_attempts <= 200:
                     self.word_length = new_length
                     self.max_attempts = new_attempts
+                    self.difficulty = difficulty_box.get() or "随机"
+                    self.board_count = int(boards_box.get() or 1)
+                    self.hard_mode = bool(hard_var.get())
                     settings_dialog.destroy()
                     self.start_new_game()
                     self.end = False
@@ -798,7 +3093,7 @@ class WordleGame:
             command=apply_settings,
             font=("Microsoft YaHei", 10),
             width=10
-        ).grid(row=2, column=0, columnspan=2, pady=10)
+        ).grid(row=5, column=0, columnspan=2, pady=10)
 
     def import_game(self):
         if not self.dictionary_loaded:
@@ -811,14 +3106,7 @@ class WordleGame:
 
         try:
             # 解码游戏代码
-            decoded = base64.b64decode(input_str).decode("utf-8")
-            parts = decoded.split(self.SEPARATOR)
-
-            if len(parts) != 2:
-                raise ValueError("无效的游戏代码格式")
-
-            word = parts[0].strip().lower()
-            chances = int(parts[1].strip())
+            word, chances = decode_game_code(input_str)
 
             # 验证输入
             if word not in self.dictionary:
@@ -831,10 +3119,12 @@ class WordleGame:
                 raise ValueError("尝试次数必须在1-200之间")
 
             # 更新游戏状态
-            self.target_word = word
+            self.board_count = 1
+            self.set_targets([word])
             self.word_length = len(word)
             self.max_attempts = chances
             self.current_attempt = 0
+            self.reset_round_state()
 
             # 重置UI并开始新游戏
             self.end = False
@@ -853,7 +3143,7 @@ class WordleGame:
         # 创建导出对话框
         export_dialog = tk.Toplevel(self.root)
         export_dialog.title("导出游戏")
-        export_dialog.geometry("400x250")
+        export_dialog.geometry("400x320")
         export_dialog.transient(self.root)
         export_dialog.grab_set()
         export_dialog.resizable(False, False)
@@ -882,9 +3172,46 @@ class WordleGame:
                               font=("Microsoft YaHei", 10))
         code_entry.grid(row=2, column=1, padx=5, pady=5, sticky="w")
 
+        # 按难度选词
+        tk.Label(export_dialog, text="按难度选词:", font=("Microsoft YaHei", 10)).grid(row=3, column=0, padx=5,
+                                                                                     pady=5, sticky="e")
+        pick_frame = tk.Frame(export_dialog)
+        pick_frame.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+        difficulty_box = ttk.Combobox(pick_frame, values=DIFFICULTY_LEVELS, state="readonly", width=6,
+                                      font=("Microsoft YaHei", 10))
+        difficulty_box.pack(side=tk.LEFT)
+        difficulty_box.set(self.difficulty)
+
+        # 难度标签
+        rating_var = tk.StringVar()
+        tk.Label(export_dialog, textvariable=rating_var, font=("Microsoft YaHei", 10)).grid(row=4, column=0,
+                                                                                          columnspan=2, pady=5)
+
         # 按钮框架
         button_frame = tk.Frame(export_dialog)
-        button_frame.grid(row=3, column=0, columnspan=2, pady=10)
+        button_frame.grid(row=5, column=0, columnspan=2, pady=10)
+
+        def show_rating(word):
+            rating = self.ratings.rating_of(self.dictionary, word)
+            if rating is None:
+                rating_var.set("暂无难度评分")
+                return
+            i = self.dictionary.buckets[len(word)].index(word)
+            rating_var.set(f"难度评分: {rating:.1f} (参考解法 {self.ratings.guesses[len(word)][i]} 次, "
+                           f"相似词 {self.ratings.traps[len(word)][i]} 个)")
+
+        def pick_word():
+            words = self.words_by_length.get(self.word_length)
+            if not words:
+                messagebox.showerror("错误", f"没有找到长度为 {self.word_length} 的单词")
+                return
+            word = words[self.pick_word_index(self.word_length, difficulty_box.get() or "随机")]
+            word_entry.delete(0, tk.END)
+            word_entry.insert(0, word)
+            show_rating(word)
+
+        tk.Button(pick_frame, text="选词", command=pick_word, font=("Microsoft YaHei", 10),
+                  width=6).pack(side=tk.LEFT, padx=5)
 
         def generate_code():
             word = word_entry.get().strip().lower()
@@ -915,9 +3242,8 @@ class WordleGame:
                 return
 
             # 生成游戏代码
-            game_data = f"{word}{self.SEPARATOR}{attempts}"
-            code = base64.b64encode(game_data.encode("utf-8")).decode("utf-8")
-            code_var.set(code)
+            code_var.set(encode_game_code(word, attempts))
+            show_rating(word)
 
         def copy_code():
             code = code_var.get()
@@ -945,21 +3271,32 @@ class WordleGame:
             width=8
         ).pack(side=tk.LEFT, padx=5)
 
-    def handle_key_press(self, event):
-        # 处理键盘事件
-        char = event.char.lower()
-        if not self.end:
-            if event.keysym == "BackSpace":
-                self.remove_letter()
-            elif event.keysym == "Return":
-                self.submit_guess()
-            elif "a" <= char <= "z":
-                self.add_letter(char)
-        else:
-            if event.keysym == "Return":
-                self.end=False
-                self.start_new_game()
+    def key_event_stamp(self, event):
+        """把键盘事件自带的时间戳换算成 perf_counter, 延迟里包含事件在队列中等待的时间
 
+        事件时间戳是窗口系统的毫秒时钟, 与 perf_counter 只差一个常数.
+        第一次按键时校准差值, 之后取见过的最小差值(等待最短的那次最接近真实差值).
+        差值突然变大很多说明时钟回绕或重置, 重新校准.
+        """
+        now = time.perf_counter()
+        event_time = getattr(event, "time", None)
+        if not isinstance(event_time, int) or event_time <= 0:
+            return now
+        offset = now - event_time / 1000
+        if self.event_time_offset is None or offset < self.event_time_offset or offset - self.event_time_offset > 60:
+            self.event_time_offset = offset
+        return event_time / 1000 + self.event_time_offset
+
+    def handle_key_press(self, event):
+        # 键盘事件和屏幕键盘走同一个输入缓冲, 实体按键用事件时间戳计算延迟
+        if event.state & 0x4 and event.keysym.lower() == "v":
+            self.paste_clipboard()
+        elif event.keysym == "BackSpace":
+            self.inject_text("\b", self.key_event_stamp(event))
+        elif event.keysym in ("Return", "KP_Enter"):
+            self.inject_text("\n", self.key_event_stamp(event))
+        elif len(event.char) == 1 and "a" <= event.char.lower() <= "z":
+            self.inject_text(event.char, self.key_event_stamp(event))
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,79 @@
+"""worldless 发布前生成随程序附带的压缩词库
+
+下载(或读取本地的) EnWords.csv, 压缩后放在 worldless.py 所在目录,
+再用游戏相同的流式解析读一遍, 确认单词和释义与原始 CSV 一致.
+生成的 EnWords.csv.xz 需要和 worldless.py 一起发布, 首次运行才不需要联网.
+
+    python worldless_bundle.py
+    python worldless_bundle.py --source EnWords.csv --format .gz
+
+默认使用 .xz: lzma 随标准库提供, 不需要额外安装; .zst 要求玩家安装 zstandard.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+
+from worldless import (DICT_URL, BUNDLED_DICT_DIR, read_dictionary_file, compress_dictionary,
+                       find_bundled_dictionary)
+
+
+def fetch_source(source, directory):
+    """source 为网址时下载到临时文件, 返回本地路径"""
+    if not source.startswith(("http://", "https://")):
+        return source
+    path = os.path.join(directory, "EnWords.csv")
+    print(f"正在下载 {source}")
+    with urllib.request.urlopen(source) as response, open(path, "wb") as f:
+        while True:
+            block = response.read(1024 * 1024)
+            if not block:
+                break
+            f.write(block)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成随程序附带的压缩词库")
+    parser.add_argument("--source", default=DICT_URL, help="CSV 词库的网址或本地路径")
+    parser.add_argument("--format", default=".xz", choices=(".xz", ".gz", ".zst"), help="压缩格式")
+    parser.add_argument("--out-dir", default=BUNDLED_DICT_DIR, help="输出目录, 默认与 worldless.py 相同")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            source = fetch_source(args.source, tmp)
+        except OSError as e:
+            print(f"下载词库失败: {e}", file=sys.stderr)
+            return 1
+
+        target = os.path.join(args.out_dir, "EnWords.csv" + args.format)
+        started = time.perf_counter()
+        try:
+            compress_dictionary(source, target)
+        except (ValueError, OSError) as e:
+            print(f"压缩词库失败: {e}", file=sys.stderr)
+            return 1
+        seconds = time.perf_counter() - started
+
+        # 用游戏的读取方式校验压缩结果
+        expected = read_dictionary_file(source, workers=1)
+        stats = {}
+        actual = read_dictionary_file(target, stats=stats)
+        if actual != expected:
+            os.remove(target)
+            print("校验失败: 压缩词库解析结果与原始 CSV 不一致, 已删除", file=sys.stderr)
+            return 1
+
+    size = os.path.getsize(target)
+    print(f"已写入 {target}: {len(actual[0])} 个单词, {stats['bytes'] / 1024 / 1024:.1f} MB -> "
+          f"{size / 1024 / 1024:.1f} MB, 压缩用时 {seconds:.1f}s, 解析 {stats['mb_per_s']:.1f} MB/s")
+    if args.out_dir == BUNDLED_DICT_DIR and find_bundled_dictionary() != target:
+        print(f"注意: 目录中还有优先级更高的词库 {find_bundled_dictionary()}, 游戏会先使用它")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""worldless 单词难度离线评分
+
+为词库中每个长度的每个单词计算难度, 写入紧凑的评分文件 (默认 EnWords.wld),
+游戏启动时读取, 新游戏和导出游戏可以直接按难度选词.
+
+    python worldless_rating.py --dict EnWords.csv --workers 8
+
+难度由两部分组成:
+    1. 参考解法猜中该词需要的次数. 参考解法每一步从剩余候选词中选出能把候选词
+       分成最多组的单词作为猜测.
+    2. 只差一个字母的同类词数量, 例如 light/might/night/right ("_ight" 陷阱).
+
+参考解法对同一长度的所有答案共用一棵决策树. 第一步之后的每个分组互不相关,
+各作为一个分片交给进程池计算. 每完成一个分片就追加到检查点文件,
+中断后重新运行会跳过已完成的分片.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from worldless import (np, WordStore, DifficultyRatings, read_dictionary_file, feedback_array,
+                       encode_feedback, score_guess)
+
+STORE = None  # 工作进程中的词库
+
+
+def load_store(dict_path, cache_path):
+    store = WordStore.load(cache_path, dict_path)
+    if store is None:
+        store = WordStore.build(*read_dictionary_file(dict_path))
+        store.save(cache_path, dict_path)
+        store = WordStore.load(cache_path, dict_path) or store
+    return store
+
+
+def init_worker(dict_path, cache_path):
+    global STORE
+    STORE = load_store(dict_path, cache_path)
+
+
+def partition_codes(bucket, guess_index, candidates):
+    """用一个猜测对一组候选词批量计分"""
+    guess = bucket[guess_index]
+    if bucket.data is not None:
+        return feedback_array(bucket.data[candidates], guess).tolist()
+    return [encode_feedback(score_guess(guess, bucket[i])) for i in candidates]
+
+
+def best_guess(bucket, candidates, pool_limit):
+    """从候选词中选出能把候选词分成最多组的猜测, 候选词太多时均匀抽取 pool_limit 个比较"""
+    if len(candidates) <= 2:
+        return candidates[0]
+
+    step = max(1, len(candidates) // pool_limit)
+    best, best_groups = candidates[0], 0
+    for guess in candidates[::step][:pool_limit]:
+        groups = len(set(partition_codes(bucket, guess, candidates)))
+        if groups > best_groups:
+            best, best_groups = guess, groups
+            if groups == len(candidates):
+                break  # 每个候选词都能区分开, 不会更好
+    return best
+
+
+def solve(bucket, candidates, depth, pool_limit):
+    """沿决策树往下求解, 返回 [(单词下标, 猜中所需次数), ...]"""
+    solved = encode_feedback("2" * bucket.length)
+    results = []
+    stack = [(candidates, depth)]
+    while stack:
+        candidates, depth = stack.pop()
+        if len(candidates) == 1:
+            results.append((candidates[0], depth))
+            continue
+
+        guess = best_guess(bucket, candidates, pool_limit)
+        groups = {}
+        for index, code in zip(candidates, partition_codes(bucket, guess, candidates)):
+            groups.setdefault(code, []).append(index)
+        for code, group in groups.items():
+            if code == solved:
+                results.append((guess, depth))
+            else:
+                stack.append((group, depth + 1))
+    return results
+
+
+def rate_shard(length, code, candidates, pool_limit):
+    results = solve(STORE.buckets[length], candidates, 2, pool_limit)
+    return length, code, results
+
+
+def trap_counts(bucket):
+    """每个单词只差一个字母的同类词数量, 取所有位置中最大的一组"""
+    words = list(bucket)
+    traps = [0] * len(words)
+    for position in range(bucket.length):
+        groups = {}
+        for i, word in enumerate(words):
+            groups.setdefault(word[:position] + "_" + word[position + 1:], []).append(i)
+        for group in groups.values():
+            for i in group:
+                traps[i] = max(traps[i], len(group) - 1)
+    return [min(trap, 65535) for trap in traps]
+
+
+def load_checkpoint(path, digests):
+    """读取检查点, 词库变化时丢弃"""
+    openers = {}
+    done = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("digests") != digests:
+                return {}, {}
+            openers = {int(length): index for length, index in header["openers"].items()}
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # 写了一半的记录
+                record = json.loads(line)
+                done[(record["l"], record["c"])] = record["r"]
+    except (OSError, ValueError, KeyError):
+        return {}, {}
+    return openers, done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="worldless 单词难度离线评分")
+    parser.add_argument("--dict", default="EnWords.csv", help="词库文件")
+    parser.add_argument("--cache", default="EnWords.wlc", help="编译后的词库缓存")
+    parser.add_argument("--out", default="EnWords.wld", help="评分输出文件")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="进程数")
+    parser.add_argument("--pool-limit", type=int, default=300, help="每步最多比较的猜测数")
+    parser.add_argument("--lengths", default="", help="只评分指定长度, 例如 5,6")
+    args = parser.parse_args()
+
+    if np is None:
+        print("未安装 NumPy, 将逐词计分, 速度会慢很多", file=sys.stderr)
+
+    started = time.perf_counter()
+    store = load_store(args.dict, args.cache)
+    lengths = sorted(store.buckets)
+    if args.lengths:
+        lengths = [length for length in lengths if str(length) in args.lengths.split(",")]
+    digests = {str(length): zlib.crc32(store.buckets[length].flat) for length in lengths}
+
+    checkpoint_path = args.out + ".ckpt"
+    openers, done = load_checkpoint(checkpoint_path, digests)
+    if done:
+        print(f"从检查点恢复 {len(done)} 个分片")
+
+    # 第一步: 每个长度选出开局猜测, 按结果把所有单词分成若干分片
+    guesses = {length: [0] * len(store.buckets[length]) for length in lengths}
+    shards = []
+    for length in lengths:
+        bucket = store.buckets[length]
+        everything = list(range(len(bucket)))
+        if length not in openers:
+            openers[length] = best_guess(bucket, everything, args.pool_limit)
+        opener = openers[length]
+        guesses[length][opener] = 1
+
+        groups = {}
+        for index, code in zip(everything, partition_codes(bucket, opener, everything)):
+            groups.setdefault(code, []).append(index)
+        solved = encode_feedback("2" * length)
+        shards.extend((length, code, group) for code, group in groups.items() if code != solved)
+
+    checkpoint_exists = os.path.exists(checkpoint_path) and done
+    with open(checkpoint_path, "a" if checkpoint_exists else "w", encoding="utf-8") as checkpoint:
+        if not checkpoint_exists:
+            checkpoint.write(json.dumps({"digests": digests,
+                                         "openers": {str(k): v for k, v in openers.items()}}) + "\n")
+            checkpoint.flush()
+
+        def finish(length, code, results):
+            for index, depth in results:
+                guesses[length][index] = min(depth, 255)
+            if (length, code) not in done:
+                done[(length, code)] = results
+                checkpoint.write(json.dumps({"l": length, "c": code, "r": results}) + "\n")
+                checkpoint.flush()
+                os.fsync(checkpoint.fileno())
+
+        pending = []
+        for length, code, group in shards:
+            if (length, code) in done:
+                finish(length, code, done[(length, code)])
+            else:
+                pending.append((length, code, group))
+
+        # 大分片先算, 进程池负载更均衡
+        pending.sort(key=lambda shard: -len(shard[2]))
+        total = len(pending)
+        last_report = 0.0
+
+        def report(count):
+            nonlocal last_report
+            now = time.perf_counter()
+            if count == total or now - last_report > 0.5:
+                last_report = now
+                print(f"\r分片 {count}/{total}", end="", flush=True)
+
+        if args.workers > 1 and total > 1:
+            with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                                     initargs=(args.dict, args.cache)) as pool:
+                futures = [pool.submit(rate_shard, length, code, group, args.pool_limit)
+                           for length, code, group in pending]
+                for count, future in enumerate(as_completed(futures), 1):
+                    finish(*future.result())
+                    report(count)
+        else:
+            global STORE
+            STORE = store
+            for count, (length, code, group) in enumerate(pending, 1):
+                finish(*rate_shard(length, code, group, args.pool_limit))
+                report(count)
+        print()
+
+    # 第二步: 陷阱词数量只需按通配符分组计数
+    ratings = DifficultyRatings.load(args.out, store)
+    for length in lengths:
+        ratings.guesses[length] = guesses[length]
+        ratings.traps[length] = trap_counts(store.buckets[length])
+        average = sum(guesses[length]) / len(guesses[length])
+        print(f"长度 {length}: {len(guesses[length])} 个单词, 开局 {store.buckets[length][openers[length]]}, "
+              f"平均 {average:.2f} 次")
+
+    ratings.save(args.out, store)
+    os.remove(checkpoint_path)
+    print(f"已写入 {args.out}, 用时 {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+"""worldless 本地游戏服务器
+
+在一个进程内为多个客户端(例如课堂上的多台电脑)提供 JSON-over-HTTP 接口,
+复用 worldless.py 的词库读取、计分规则和游戏代码.
+
+    python worldless_server.py serve --port 8765
+    python worldless_server.py bench --clients 64 --sessions 2000
+
+接口:
+    POST /session  {"length": 5, "attempts": 6} 或 {"code": "游戏代码"}
+    POST /guess    {"session": "...", "guess": "crane"}
+    GET  /session?id=...
+    POST /export   {"word": "crane", "attempts": 6}
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit, parse_qs
+
+from worldless import read_dictionary_file, score_guess, encode_game_code, decode_game_code
+
+SESSION_TTL = 3600  # 会话闲置多久后回收(秒)
+MAX_BODY = 64 * 1024  # 请求体上限(字节), 正常请求不超过几百字节
+
+
+class DictionaryIndex:
+    """所有会话共享的只读词库索引"""
+
+    __slots__ = ("words_by_length", "valid", "meanings")
+
+    def __init__(self, words, meanings):
+        buckets = {}
+        for word in dict.fromkeys(words):
+            buckets.setdefault(len(word), []).append(word)
+        self.words_by_length = {length: tuple(bucket) for length, bucket in buckets.items()}
+        self.valid = {length: frozenset(bucket) for length, bucket in buckets.items()}
+        self.meanings = meanings
+
+    def __contains__(self, word):
+        return word in self.valid.get(len(word), ())
+
+    def random_word(self, length):
+        bucket = self.words_by_length.get(length)
+        if not bucket:
+            raise ValueError(f"没有找到长度为 {length} 的单词")
+        return random.choice(bucket)
+
+
+class Session:
+    """单个玩家的游戏状态, 只保存必要字段"""
+
+    __slots__ = ("target", "max_attempts", "guesses", "feedbacks", "status", "last_seen")
+
+    def __init__(self, target, max_attempts):
+        self.target = target
+        self.max_attempts = max_attempts
+        self.guesses = []
+        self.feedbacks = []
+        self.status = "playing"
+        self.last_seen = time.monotonic()
+
+    def to_dict(self, with_answer=False):
+        data = {
+            "length": len(self.target),
+            "attempts": self.max_attempts,
+            "guesses": self.guesses,
+            "feedbacks": self.feedbacks,
+            "status": self.status,
+        }
+        if with_answer or self.status != "playing":
+            data["answer"] = self.target
+        return data
+
+
+class GuessBatcher:
+    """把同一轮事件循环内收到的猜测合并成一批校验"""
+
+    def __init__(self, index):
+        self.index = index
+        self.pending = []
+        self.scheduled = False
+        self.batches = 0
+        self.batched_guesses = 0
+
+    def validate(self, word):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((word, future))
+        if not self.scheduled:
+            self.scheduled = True
+            asyncio.get_running_loop().call_soon(self.flush)
+        return future
+
+    def flush(self):
+        pending, self.pending = self.pending, []
+        self.scheduled = False
+        self.batches += 1
+        self.batched_guesses += len(pending)
+
+        valid = self.index.valid
+        for word, future in pending:
+            if not future.done():
+                future.set_result(word in valid.get(len(word), ()))
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class GameServer:
+
+    def __init__(self, index):
+        self.index = index
+        self.sessions = {}
+        self.batcher = GuessBatcher(index)
+
+    # ---- 游戏逻辑 ----
+
+    def create_session(self, body):
+        try:
+            if body.get("code"):
+                if not isinstance(body["code"], str):
+                    raise ValueError("游戏代码必须是字符串")
+                word, attempts = decode_game_code(body["code"])
+                if word not in self.index:
+                    raise ValueError("单词不在词库中")
+            else:
+                length = int(body.get("length", 5))
+                attempts = int(body.get("attempts", 6))
+                if not (3 <= length <= 12):
+                    raise ValueError("单词长度必须在3-12之间")
+                word = self.index.random_word(length)
+            if not (1 <= attempts <= 200):
+                raise ValueError("尝试次数必须在1-200之间")
+        except (ValueError, TypeError) as e:
+            raise HttpError(400, str(e))
+
+        session_id = secrets.token_urlsafe(9)
+        self.sessions[session_id] = Session(word, attempts)
+        return {"session": session_id, "length": len(word), "attempts": attempts}
+
+    def get_session(self, session_id):
+        if not isinstance(session_id, str):
+            raise HttpError(400, "会话编号必须是字符串")
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HttpError(404, "会话不存在或已过期")
+        session.last_seen = time.monotonic()
+        return session
+
+    async def guess(self, body):
+        session = self.get_session(body.get("session", ""))
+        guess = body.get("guess", "")
+        if not isinstance(guess, str):
+            raise HttpError(400, "猜测必须是字符串")
+        guess = guess.strip().lower()
+
+        # 与 submit_guess 相同的检查顺序
+        if session.status != "playing":
+            raise HttpError(409, "游戏已结束")
+        if len(guess) != len(session.target):
+            raise HttpError(400, "请完成单词输入！")
+        if not await self.batcher.validate(guess):
+            raise HttpError(400, "单词不在词库中！")
+
+        codes = score_guess(guess, session.target)
+        session.guesses.append(guess)
+        session.feedbacks.append(codes)
+        if guess == session.target:
+            session.status = "won"
+        elif len(session.guesses) == session.max_attempts:
+            session.status = "lost"
+
+        result = {"feedback": codes, "attempt": len(session.guesses), "status": session.status,
+                  "meaning": self.index.meanings.get(guess, "")}
+        if session.status != "playing":
+            result["answer"] = session.target
+        return result
+
+    def export(self, body):
+        word = body.get("word", "")
+        if not isinstance(word, str):
+            raise HttpError(400, "单词必须是字符串")
+        word = word.strip().lower()
+        try:
+            attempts = int(body.get("attempts", 6))
+        except (ValueError, TypeError):
+            raise HttpError(400, "请输入有效的尝试次数")
+        if word not in self.index:
+            raise HttpError(400, "单词不在词库中")
+        if not (1 <= attempts <= 200):
+            raise HttpError(400, "请输入有效的尝试次数")
+        return {"code": encode_game_code(word, attempts)}
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        if method == "POST" and url.path == "/session":
+            return self.create_session(body)
+        if method == "POST" and url.path == "/guess":
+            return await self.guess(body)
+        if method == "GET" and url.path == "/session":
+            session_id = parse_qs(url.query).get("id", [""])[0]
+            return self.get_session(session_id).to_dict()
+        if method == "POST" and url.path == "/export":
+            return self.export(body)
+        if method == "GET" and url.path == "/stats":
+            return {"sessions": len(self.sessions), "batches": self.batcher.batches,
+                    "batched_guesses": self.batcher.batched_guesses}
+        raise HttpError(404, "未知接口")
+
+    async def expire_sessions(self):
+        while True:
+            await asyncio.sleep(60)
+            deadline = time.monotonic() - SESSION_TTL
+            for session_id in [k for k, v in self.sessions.items() if v.last_seen < deadline]:
+                del self.sessions[session_id]
+
+    # ---- HTTP ----
+
+    @staticmethod
+    def parse_head(head):
+        """解析请求行和请求头, 格式错误时抛出 HttpError"""
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "无效的请求行")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+
+        length = headers.get("content-length", "0") or "0"
+        if not length.isdigit():
+            raise HttpError(400, "无效的 Content-Length")
+        if int(length) > MAX_BODY:
+            raise HttpError(413, "请求体过大")
+        return method, target, headers, int(length)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False  # 请求头或请求体读不完整时回复后断开
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                    method, target, headers, length = self.parse_head(head)
+                    raw = await reader.readexactly(length) if length else b""
+                    keep_alive = headers.get("connection", "").lower() != "close"
+
+                    body = json.loads(raw) if raw else {}
+                    if not isinstance(body, dict):
+                        raise HttpError(400, "请求体必须是 JSON 对象")
+                    status, payload = 200, await self.dispatch(method, target, body)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    status, payload = 431, {"error": "请求头过大"}
+                except HttpError as e:
+                    status, payload = e.status, {"error": e.message}
+                except (ValueError, TypeError):
+                    status, payload = 400, {"error": "无效的请求"}
+
+                data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+
+def load_index(path):
+    words, meanings, _ = read_dictionary_file(path)
+    return DictionaryIndex(words, meanings)
+
+
+async def serve(args):
+    if args.cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {args.cpu})
+
+    server = GameServer(load_index(args.dict))
+    tcp = await asyncio.start_server(server.handle_connection, args.host, args.port, backlog=1024)
+    asyncio.get_running_loop().create_task(server.expire_sessions())
+    print(f"worldless 服务器已启动: http://{args.host}:{args.port} ({len(server.index.meanings)} 个单词)", flush=True)
+    async with tcp:
+        await tcp.serve_forever()
+
+
+# ---- 压力测试 ----
+
+class Client:
+    """压测用的最小 HTTP/1.1 长连接客户端"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, method, path, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1")
+            + data
+        )
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in head.decode("latin-1").split("\r\n"):
+            if line.lower().startswith("content-length:"):
+                length = int(line.split(":", 1)[1])
+        return json.loads(await self.reader.readexactly(length))
+
+
+async def run_client(host, port, index, length, sessions, latencies, counter):
+    reader, writer = await asyncio.open_connection(host, port)
+    client = Client(reader, writer)
+    words = index.words_by_length[length]
+    try:
+        while counter[0] < sessions:
+            counter[0] += 1
+            created = await client.request("POST", "/session", {"length": length, "attempts": 6})
+            while True:
+                start = time.perf_counter()
+                result = await client.request("POST", "/guess",
+                                              {"session": created["session"], "guess": random.choice(words)})
+                latencies.append(time.perf_counter() - start)
+                if result.get("status") != "playing":
+                    break
+    finally:
+        writer.close()
+
+
+async def bench(args):
+    index = load_index(args.dict)
+    port = args.port
+
+    # 服务器单独运行在一个进程(并绑定到一个 CPU), 客户端在本进程
+    cmd = [sys.executable, os.path.abspath(__file__), "serve", "--dict", args.dict,
+           "--host", "127.0.0.1", "--port", str(port), "--cpu", str(args.cpu or 0)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    try:
+        proc.stdout.readline()  # 等待启动信息
+
+        latencies = []
+        counter = [0]
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            run_client("127.0.0.1", port, index, args.length, args.sessions, latencies, counter)
+            for _ in range(args.clients)
+        ))
+        elapsed = time.perf_counter() - start
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"客户端: {args.clients}  完成会话: {counter[0]}  猜测: {len(latencies)}  耗时: {elapsed:.2f}s")
+    print(f"会话/秒: {counter[0] / elapsed:.0f}  猜测/秒: {len(latencies) / elapsed:.0f}")
+    print(f"猜测延迟 p50: {p50:.2f}ms  p99: {p99:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="worldless 本地游戏服务器")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = sub.add_parser("serve", help="启动服务器")
+    bench_parser = sub.add_parser("bench", help="单核压力测试")
+    for p in (serve_parser, bench_parser):
+        p.add_argument("--dict", default="EnWords.csv", help="词库文件")
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=8765)
+        p.add_argument("--cpu", type=int, default=None, help="把服务器绑定到指定 CPU")
+    bench_parser.add_argument("--clients", type=int, default=64, help="并发客户端数")
+    bench_parser.add_argument("--sessions", type=int, default=2000, help="总会话数")
+    bench_parser.add_argument("--length", type=int, default=5, help="单词长度")
+
+    args = parser.parse_args()
+    asyncio.run(serve(args) if args.command == "serve" else bench(args))
+
+
+if __name__ == "__main__":
+    main()